@@ -1,5 +1,7 @@
 # Rules for RAF (Reste À Faire) calculation based on connection level and project phase
 
+from config.rule_table import LEVEL_ALIASES, build_rule_table, lookup_rule_values
+
 # Mapping of connection level and phase to RAF (Remaining Work to Do)
 RAF_RULES = {
     "Connexion EDI": {
@@ -101,8 +103,7 @@ def get_raf(connection_level, project_phase):
         return None
 
     # Special case for "Connexion EDI Sortante Pilote" - use "Connexion EDI Pilote" rules
-    if connection_level == "Connexion EDI Sortante Pilote":
-        connection_level = "Connexion EDI Pilote"
+    connection_level = LEVEL_ALIASES.get(connection_level, connection_level)
 
     # Check if connection level exists in rules
     if connection_level not in RAF_RULES:
@@ -113,4 +114,21 @@ def get_raf(connection_level, project_phase):
     if project_phase not in phase_rules:
         return None
 
-    return phase_rules[project_phase]
\ No newline at end of file
+    return phase_rules[project_phase]
+
+
+RAF_LEVELS, RAF_PHASES, RAF_TABLE = build_rule_table(RAF_RULES)
+
+
+def get_raf_values(connection_levels, project_phases):
+    """
+    Vectorized RAF lookup for whole columns of connection levels and project phases.
+
+    Args:
+        connection_levels (pandas.Series): The connection levels
+        project_phases (pandas.Series): The project phases
+
+    Returns:
+        numpy.ndarray: The RAF values, NaN where no matching rule is found
+    """
+    return lookup_rule_values(RAF_LEVELS, RAF_PHASES, RAF_TABLE, connection_levels, project_phases)
@@ -0,0 +1,56 @@
+# Shared helpers turning the connection level / project phase rule mappings into lookup tables
+
+import numpy as np
+import pandas as pd
+
+# Connection levels that use the rules of another level
+LEVEL_ALIASES = {
+    "Connexion EDI Sortante Pilote": "Connexion EDI Pilote",
+}
+
+
+def build_rule_table(rules):
+    """
+    Flatten a {connection level: {project phase: value}} mapping into level and phase indexes and a 2-D lookup table.
+
+    Args:
+        rules (dict): The rules mapping, e.g. RAF_RULES or THEORETICAL_CHARGE_RULES
+
+    Returns:
+        tuple: (levels, phases, table) where table[levels.get_loc(level), phases.get_loc(phase)] is the value
+    """
+    phases = pd.Index(dict.fromkeys(phase for phase_rules in rules.values() for phase in phase_rules))
+    table = np.full((len(rules), len(phases)), np.nan)
+    for row, phase_rules in enumerate(rules.values()):
+        table[row, phases.get_indexer(list(phase_rules))] = list(phase_rules.values())
+
+    # Aliased levels get a copy of their target's row
+    levels = pd.Index(list(rules) + list(LEVEL_ALIASES))
+    table = np.vstack([table] + [table[levels.get_loc(target)] for target in LEVEL_ALIASES.values()])
+
+    return levels, phases, table
+
+
+def lookup_rule_values(levels, phases, table, connection_levels, project_phases):
+    """
+    Vectorized lookup in a table built by build_rule_table for whole columns of connection levels and project phases.
+
+    Args:
+        levels (pandas.Index): The connection levels of the table rows
+        phases (pandas.Index): The project phases of the table columns
+        table (numpy.ndarray): The 2-D lookup table
+        connection_levels (pandas.Series): The connection levels
+        project_phases (pandas.Series): The project phases
+
+    Returns:
+        numpy.ndarray: The values, NaN where no matching rule is found
+    """
+    # Integer codes straight from the hash-indexed level and phase names (-1 for unknown or missing values)
+    level_codes = levels.get_indexer(connection_levels)
+    phase_codes = phases.get_indexer(project_phases)
+
+    values = np.full(len(level_codes), np.nan)
+    found = (level_codes >= 0) & (phase_codes >= 0)
+    values[found] = table[level_codes[found], phase_codes[found]]
+
+    return values
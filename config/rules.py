@@ -1,5 +1,7 @@
 # Rules for theoretical charge calculation based on connection level and project phase
 
+from config.rule_table import LEVEL_ALIASES, build_rule_table, lookup_rule_values
+
 # Mapping of connection level and phase to theoretical charge (NB JH)
 THEORETICAL_CHARGE_RULES = {
     "Connexion EDI": {
@@ -164,8 +166,7 @@ def get_theoretical_charge(connection_level, project_phase):
         return None
 
     # Special case for "Connexion EDI Sortante Pilote" - use "Connexion EDI Pilote" rules
-    if connection_level == "Connexion EDI Sortante Pilote":
-        connection_level = "Connexion EDI Pilote"
+    connection_level = LEVEL_ALIASES.get(connection_level, connection_level)
 
     # Check if connection level exists in rules
     if connection_level not in THEORETICAL_CHARGE_RULES:
@@ -176,4 +177,22 @@ def get_theoretical_charge(connection_level, project_phase):
     if project_phase not in phase_rules:
         return None
 
-    return phase_rules[project_phase]
\ No newline at end of file
+    return phase_rules[project_phase]
+
+
+THEORETICAL_LEVELS, THEORETICAL_PHASES, THEORETICAL_CHARGE_TABLE = build_rule_table(THEORETICAL_CHARGE_RULES)
+
+
+def get_theoretical_charge_values(connection_levels, project_phases):
+    """
+    Vectorized theoretical charge lookup for whole columns of connection levels and project phases.
+
+    Args:
+        connection_levels (pandas.Series): The connection levels
+        project_phases (pandas.Series): The project phases
+
+    Returns:
+        numpy.ndarray: The theoretical charges, NaN where no matching rule is found
+    """
+    return lookup_rule_values(THEORETICAL_LEVELS, THEORETICAL_PHASES, THEORETICAL_CHARGE_TABLE,
+                              connection_levels, project_phases)
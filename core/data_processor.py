@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from config.rules import get_theoretical_charge
+from config.rules import get_theoretical_charge, get_theoretical_charge_values
 
 
 class DataProcessor:
@@ -46,6 +47,35 @@ class DataProcessor:
 
         return result_dict
 
+    @staticmethod
+    def create_project_lookup(deployments_df, column_names, last_row_columns=()):
+        """
+        Build a lookup table of project information from the deployments in a single groupby pass.
+
+        Args:
+            deployments_df (pandas.DataFrame): The deployments DataFrame
+            column_names (list): Columns taking the last non-null value of each project,
+                as create_connection_dict does
+            last_row_columns (list): Columns taking the value of each project's last row, even if null
+
+        Returns:
+            pandas.DataFrame: One row per project name (index 'Nom') holding the requested
+                columns that exist in deployments_df
+        """
+        present = [column_name for column_name in column_names if column_name in deployments_df.columns]
+        present_rows = [column_name for column_name in last_row_columns if column_name in deployments_df.columns]
+        if not present and not present_rows:
+            return pd.DataFrame()
+
+        grouped = deployments_df.groupby('Nom', sort=False)
+        parts = []
+        if present:
+            parts.append(grouped[present].last())
+        if present_rows:
+            parts.append(grouped[present_rows].last(skipna=False))
+
+        return pd.concat(parts, axis=1)
+
     @staticmethod
     def calculate_charge_jh(df):
         """
@@ -57,9 +87,39 @@ class DataProcessor:
         Returns:
             pandas.DataFrame: DataFrame with added Charge JH column
         """
-        df_copy = df.copy()
-        df_copy['Charge JH'] = df_copy['Soumise (h)'] / 8
-        return df_copy
+        # Divide the raw float array and attach it with assign, instead of deep-copying the whole frame first
+        soumise = df['Soumise (h)'].to_numpy(dtype=np.float64, na_value=np.nan)
+        return df.assign(**{'Charge JH': soumise / 8.0})
+
+    @staticmethod
+    def add_project_details(pivot_df, lookup, with_duree=True):
+        """
+        Add the Montant, Dernière Note and Durée columns format_resource_summary expects to a pivot table.
+
+        Args:
+            pivot_df (pandas.DataFrame): The pivot table DataFrame, with a 'Projet' column
+            lookup (pandas.DataFrame): Project lookup as built by create_project_lookup, with
+                'Dernière Note' and "Date d'affectation" taken from each project's last row
+            with_duree (bool): Whether to fill Durée (days since Date d'affectation) or leave it empty
+
+        Returns:
+            pandas.DataFrame: The pivot table with the added columns
+        """
+        # Single left merge on the project (columns missing from the deployments come out empty)
+        merged_columns = ['Montant total (Contrat) (Commande)', 'Dernière Note', "Date d'affectation"]
+        pivot_df = pivot_df.merge(lookup.reindex(columns=merged_columns), left_on='Projet', right_index=True, how='left')
+        date_affect = pivot_df.pop("Date d'affectation")
+        if with_duree and date_affect.notna().any():
+            # format='mixed' parses each value on its own, like a per-project to_datetime call.
+            # Day counts fit losslessly in a nullable Int32, half the width of the float64 .dt.days gives;
+            # the Series is assigned as is (date_affect was popped from pivot_df, so the index aligns)
+            date_affect = pd.to_datetime(date_affect, errors="coerce", format="mixed").dt.normalize()
+            today = pd.Timestamp.now().normalize()
+            pivot_df["Durée"] = (today - date_affect).dt.days.astype("Int32")
+        else:
+            pivot_df["Durée"] = None
+
+        return pivot_df
 
     @staticmethod
     def calculate_theoretical_charge(connection_level, project_phase):
@@ -135,7 +195,7 @@ class DataProcessor:
     #
     #     return result_df
     @staticmethod
-    def format_resource_summary(pivot_df, connection_dict, phase_dict, montant_dict):
+    def format_resource_summary(pivot_df, connection_dict, phase_dict, montant_dict, resource_totals=None):
         """
         Format the resource summary with hierarchical structure.
 
@@ -144,61 +204,74 @@ class DataProcessor:
             connection_dict (dict): Dictionary of connection levels by project
             phase_dict (dict): Dictionary of project phases by project
             montant_dict (dict): Dictionary of montant total by project
+            resource_totals (pandas.Series or None): Charge JH totals by resource computed before
+                pivot_df was filtered; resources missing from pivot_df still get their row
 
         Returns:
             pandas.DataFrame: The formatted resource summary
         """
-        # Create output DataFrame with all required columns
-        result_df = pd.DataFrame(columns=[
+        columns = [
             'Resource/ PROJET', 'Charge JH', 'Somme de Charge JH',
             'Niveau de connexion', 'Phase du projet', 'Charge Theorique', 'Ecart','Montant total (Contrat) (Commande)','Dernière Note','Durée'
-        ])
+        ]
+        # Collect the output rows in a list and build the DataFrame once at the end
+        rows = []
 
         current_resource = None
-        row_index = 0
+
+        if resource_totals is None:
+            resource_charges = pivot_df.groupby('Ressource')['Charge JH'].sum()
+        else:
+            resource_charges = resource_totals
+            # Placeholder rows (no project) for resources whose projects were all filtered out
+            missing = resource_totals.index.difference(pivot_df['Ressource'].unique())
+            if len(missing):
+                pivot_df = pd.concat([pivot_df, pd.DataFrame({'Ressource': missing})], ignore_index=True)
 
         # Sort by resource first, then by project
         pivot_df = pivot_df.sort_values(['Ressource', 'Projet'])
 
-        for _, row in pivot_df.iterrows():
-            resource = row['Ressource']
-            project = row['Projet']
-            charge = row['Charge JH']
-            ca = row['Montant total (Contrat) (Commande)']
-            dn = row ['Dernière Note']
-            du = row['Durée']
+        # Theoretical charge and Ecart of every project row in one vectorized lookup (NaN when no rule matches)
+        projects = pivot_df['Projet']
+        theoretical_charges = get_theoretical_charge_values(projects.map(connection_dict), projects.map(phase_dict))
+        ecarts = theoretical_charges - pivot_df['Charge JH'].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        for resource, project, charge, ca, dn, du, theoretical_charge, ecart in zip(
+                pivot_df['Ressource'], pivot_df['Projet'], pivot_df['Charge JH'],
+                pivot_df['Montant total (Contrat) (Commande)'], pivot_df['Dernière Note'], pivot_df['Durée'],
+                theoretical_charges, ecarts):
 
             # If this is a new resource, add the resource row
             if resource != current_resource:
-                result_df.loc[row_index, 'Resource/ PROJET'] = resource
-                resource_charge = pivot_df[pivot_df['Ressource'] == resource]['Charge JH'].sum()
-                result_df.loc[row_index, 'Somme de Charge JH'] = resource_charge
-                row_index += 1
+                rows.append({
+                    'Resource/ PROJET': resource,
+                    'Somme de Charge JH': resource_charges[resource],
+                })
                 current_resource = resource
 
+            if pd.isna(project):
+                continue
+
             # Look up connection level and project phase for this project
             connection_level = connection_dict.get(project, '')
             project_phase = phase_dict.get(project, '')
 
-            # Calculate theoretical charge if both values are available
-            theoretical_charge = None
-            if connection_level and project_phase:
-                theoretical_charge = DataProcessor.calculate_theoretical_charge(connection_level, project_phase)
-
             # Add the project row indented under the resource
-            result_df.loc[row_index, 'Resource/ PROJET'] = f"    {project}"
-            result_df.loc[row_index, 'Charge JH'] = charge
-            result_df.loc[row_index, 'Niveau de connexion'] = connection_level
-            result_df.loc[row_index, 'Phase du projet'] = project_phase
-            result_df.loc[row_index, 'Montant total (Contrat) (Commande)'] = ca
-            result_df.loc[row_index, 'Dernière Note'] = dn
-            result_df.loc[row_index, 'Durée'] = du
-
-            if theoretical_charge is not None:
-                result_df.loc[row_index, 'Charge Theorique'] = theoretical_charge
-                # Calculate Ecart (Charge Theorique - Charge JH)
-                result_df.loc[row_index, 'Ecart'] = theoretical_charge - charge
-
-            row_index += 1
-
-        return result_df
\ No newline at end of file
+            project_row = {
+                'Resource/ PROJET': f"    {project}",
+                'Charge JH': charge,
+                'Niveau de connexion': connection_level,
+                'Phase du projet': project_phase,
+                'Montant total (Contrat) (Commande)': ca,
+                'Dernière Note': dn,
+                'Durée': du,
+            }
+
+            if not np.isnan(theoretical_charge):
+                project_row['Charge Theorique'] = theoretical_charge
+                # Ecart = Charge Theorique - Charge JH
+                project_row['Ecart'] = ecart
+
+            rows.append(project_row)
+
+        return pd.DataFrame(rows, columns=columns)
@@ -1,6 +1,6 @@
 import pandas as pd
 import calendar
-from config.raf_rules import get_raf
+from config.raf_rules import get_raf_values
 
 
 class DeploymentProcessor:
@@ -36,21 +36,13 @@ class DeploymentProcessor:
         Returns:
             pandas.DataFrame: DataFrame with added RAF column
         """
-        result_df = df.copy()
+        if 'Niveau de connexion' not in df.columns or 'Phase du projet' not in df.columns:
+            return df.assign(RAF=None)
 
-        # Add RAF column with NaN values
-        result_df['RAF'] = None
+        # Gather the RAF values from the precomputed (level, phase) table in one vectorized pass
+        raf = get_raf_values(df['Niveau de connexion'], df['Phase du projet'])
 
-        # Calculate RAF for each row
-        for idx, row in result_df.iterrows():
-            connection_level = row.get('Niveau de connexion')
-            project_phase = row.get('Phase du projet')
-
-            if connection_level and project_phase:
-                raf_value = get_raf(connection_level, project_phase)
-                result_df.at[idx, 'RAF'] = raf_value
-
-        return result_df
+        return df.assign(RAF=raf)
 
     @staticmethod
     def calculate_monthly_raf(df):
@@ -63,13 +55,13 @@ class DeploymentProcessor:
         Returns:
             pandas.DataFrame: DataFrame with monthly RAF sums
         """
-        # Create a copy of the dataframe
-        monthly_df = df.copy()
-
         # Check if both required columns exist
-        if 'Date de MEP' not in monthly_df.columns or 'RAF' not in monthly_df.columns:
+        if 'Date de MEP' not in df.columns or 'RAF' not in df.columns:
             return pd.DataFrame(columns=['Month', 'Year', 'Month Name', 'Total RAF'])
 
+        # Work on a copy of the two columns needed rather than the whole dataframe
+        monthly_df = df[['Date de MEP', 'RAF']].copy()
+
         # Convert Date de MEP to datetime if it's not already
         if not pd.api.types.is_datetime64_any_dtype(monthly_df['Date de MEP']):
             # Try to convert while preserving original format
@@ -78,20 +70,13 @@ class DeploymentProcessor:
         # Drop rows with missing dates or RAF values
         monthly_df = monthly_df.dropna(subset=['Date de MEP', 'RAF'])
 
-        # Extract month and year
-        monthly_df['Month'] = monthly_df['Date de MEP'].dt.month
-        monthly_df['Year'] = monthly_df['Date de MEP'].dt.year
-
-        # Add month name
-        monthly_df['Month Name'] = monthly_df['Date de MEP'].dt.strftime('%B')
-
-        # Group by month and year, sum the RAF values
-        result = monthly_df.groupby(['Year', 'Month', 'Month Name'])['RAF'].sum().reset_index()
-
-        # Rename the column for clarity
-        result = result.rename(columns={'RAF': 'Total RAF'})
+        # Extract month, year and month name through a single dt accessor
+        mep = monthly_df['Date de MEP'].dt
+        monthly_df = monthly_df.assign(Month=mep.month, Year=mep.year, **{'Month Name': mep.month_name()})
 
-        # Sort by year and month
-        result = result.sort_values(['Year', 'Month'])
+        # Group by month and year, sum the RAF values; groupby already sorts by year and month
+        result = (monthly_df.groupby(['Year', 'Month', 'Month Name'], sort=True)['RAF']
+                  .sum()
+                  .reset_index(name='Total RAF'))
 
         return result
\ No newline at end of file
@@ -1,6 +1,56 @@
+import hashlib
+import tempfile
+import numpy as np
 import pandas as pd
 import os
-from openpyxl.styles import Font
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+
+# Prefer the Rust-based calamine reader when python-calamine is installed, it parses much faster than openpyxl
+try:
+    import python_calamine  # noqa: F401
+    _READ_ENGINE = 'calamine'
+except ImportError:
+    _READ_ENGINE = 'openpyxl'
+
+# Parsed inputs are cached here between runs (see ExcelHandler.cached_read)
+_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'resource_tab_cache')
+
+# Rows converted to Python values at a time while streaming a sheet
+_WRITE_CHUNK_ROWS = 10000
+
+# Shared cell styles (openpyxl styles are immutable, so one instance serves every cell)
+_BOLD_FONT = Font(bold=True)
+# Light green color (vert accentuation6 plus clair 60%)
+_GREEN_FILL = PatternFill(start_color="FFC6E0B4", end_color="FFC6E0B4", fill_type="solid")
+# Light red color (same grade but red)
+_RED_FILL = PatternFill(start_color="FFF8CBAD", end_color="FFF8CBAD", fill_type="solid")
+
+
+def _resource_row_mask(df):
+    """Boolean array flagging resource rows, i.e. rows whose first column is not indented."""
+    if df.columns.empty:
+        return np.zeros(len(df), dtype=bool)
+    return ~df.iloc[:, 0].astype(str).str.startswith('    ').to_numpy(dtype=bool)
+
+
+def _private_cache_dir():
+    """
+    Return the input cache directory, or None when it cannot be used safely.
+
+    Cached pickles are only loaded from a directory owned by the current user.
+    """
+    try:
+        os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+        if hasattr(os, 'getuid') and os.stat(_CACHE_DIR).st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    return _CACHE_DIR
 
 
 class ExcelHandler:
@@ -9,23 +59,164 @@ class ExcelHandler:
     """
 
     @staticmethod
-    def read_excel(file_path):
+    def read_excel(file_path, usecols=None, dtype=None):
         """
         Read an Excel file and return a pandas DataFrame.
 
         Args:
             file_path (str): Path to the Excel file
+            usecols (list or None): Only parse these columns
+            dtype (dict or None): Data types to apply to columns
+
+        Returns:
+            pandas.DataFrame: The data from the Excel file
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        return pd.read_excel(file_path, engine=_READ_ENGINE, usecols=usecols, dtype=dtype)
+
+    @staticmethod
+    def cached_read(reader, file_path, *args, **kwargs):
+        """
+        Call an ExcelHandler reader, caching the parsed DataFrame on disk.
+
+        Entries are keyed by the file's absolute path, modification time and size plus the
+        reader and its arguments, so an edited file is always parsed again. Writing a new
+        entry deletes the older ones of the same file and reader call, so the cache holds
+        at most one version of each.
+
+        Args:
+            reader (callable): The reader to call, e.g. ExcelHandler.read_excel
+            file_path (str): Path to the Excel file
+            *args: Extra positional arguments for the reader
+            **kwargs: Extra keyword arguments for the reader
 
         Returns:
             pandas.DataFrame: The data from the Excel file
         """
+        cache_dir = _private_cache_dir()
+        if cache_dir is None or not os.path.exists(file_path):
+            return reader(file_path, *args, **kwargs)
+
+        stat = os.stat(file_path)
+        # Entry names are "<source>_<version>.pkl": the source part identifies the file and reader call,
+        # the version part the state of the file it was parsed from
+        source = repr((os.path.abspath(file_path), reader.__qualname__, args, sorted(kwargs.items())))
+        version = repr((stat.st_mtime_ns, stat.st_size, _READ_ENGINE))
+        prefix = hashlib.sha1(source.encode()).hexdigest() + '_'
+        cache_name = prefix + hashlib.sha1(version.encode()).hexdigest() + '.pkl'
+        cache_path = os.path.join(cache_dir, cache_name)
+        if os.path.exists(cache_path):
+            try:
+                return pd.read_pickle(cache_path)
+            except Exception:
+                pass  # Unreadable entry: parse the file again and overwrite it
+
+        df = reader(file_path, *args, **kwargs)
+        # Write to a temporary file first so a concurrent run never loads a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return df
+
+        # Evict the entries parsed from earlier versions of the file
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name != cache_name:
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass  # Already removed by a concurrent run
+
+        return df
+
+    @staticmethod
+    def peek_header(file_path):
+        """
+        Read only the header row of the first sheet of an Excel file.
+
+        Uses the same engine as read_excel, so any file it can read (including .xls
+        with calamine) can be validated first.
+
+        Args:
+            file_path (str): Path to the Excel file
+
+        Returns:
+            list: The column names, in sheet order
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        if _READ_ENGINE == 'calamine':
+            return pd.read_excel(file_path, engine='calamine', nrows=0).columns.tolist()
+
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+
+        return list(header)
+
+    @staticmethod
+    def read_excel_columns(file_path, columns, keep_blank_rows=False):
+        """
+        Read only the given columns of the first sheet of an Excel file.
+
+        With calamine available the columns are parsed by pandas' calamine engine,
+        otherwise the sheet is streamed row by row through openpyxl in read-only mode.
+        Formula cells give their cached values. Columns missing from the header are
+        left out of the result, so callers can keep checking ``df.columns`` as they
+        would after a full read.
+
+        Args:
+            file_path (str): Path to the Excel file
+            columns (list): Names of the columns to keep
+            keep_blank_rows (bool): Keep one DataFrame row per sheet row, blank rows included,
+                so row i of the result is row i + 2 of the sheet
+
+        Returns:
+            pandas.DataFrame: The requested columns of the Excel file
+        """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        return pd.read_excel(file_path)
+        # The streamed read below is the one that can keep blank rows in place
+        if _READ_ENGINE == 'calamine' and not keep_blank_rows:
+            wanted = set(columns)
+            df = pd.read_excel(file_path, engine='calamine', usecols=lambda name: name in wanted)
+            # Same shape as the streamed read: requested column order, blank rows skipped
+            df = df[[col for col in columns if col in df.columns]]
+            return df.dropna(how='all').reset_index(drop=True)
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            positions = {name: i for i, name in enumerate(header) if name in columns}
+            wanted = [col for col in columns if col in positions]
+            indices = [positions[col] for col in wanted]
+
+            data = {col: [] for col in wanted}
+            for row in rows:
+                values = [row[i] if i < len(row) else None for i in indices]
+                # Skip blank rows, as pandas.read_excel does, unless they must stay aligned with the sheet
+                if not keep_blank_rows and all(value is None for value in values):
+                    continue
+                for col, value in zip(wanted, values):
+                    data[col].append(value)
+        finally:
+            workbook.close()
+
+        return pd.DataFrame(data, columns=wanted)
 
     @staticmethod
-    def create_pivot_table(df, values, index, aggfunc='sum'):
+    def create_pivot_table(df, values, index, aggfunc='sum', sort=True, observed=True, fill_value=None):
         """
         Create a pivot table from a DataFrame.
 
@@ -34,6 +225,10 @@ class ExcelHandler:
             values (str or list): Column(s) to aggregate
             index (list): Columns to group by
             aggfunc (str or function): Aggregation function
+            sort (bool): Sort the result by the index columns; callers that reorder
+                the rows themselves can skip it
+            observed (bool): Keep categorical keys to the combinations present in the data
+            fill_value (scalar or None): Value replacing missing aggregates
 
         Returns:
             pandas.DataFrame: The resulting pivot table
@@ -41,9 +236,19 @@ class ExcelHandler:
         pivot_df = df.pivot_table(
             values=values,
             index=index,
-            aggfunc=aggfunc
+            aggfunc=aggfunc,
+            sort=sort,
+            observed=observed,
+            fill_value=fill_value
         ).reset_index()
 
+        # pivot_table leaves the values columns out when df is empty (e.g. every row was filtered out);
+        # add them back empty so callers can always rely on them
+        value_columns = [values] if isinstance(values, str) else list(values)
+        missing = [column for column in value_columns if column not in pivot_df.columns]
+        if missing:
+            pivot_df = pivot_df.reindex(columns=[*pivot_df.columns, *missing])
+
         return pivot_df
 
     # @staticmethod
@@ -78,103 +283,104 @@ class ExcelHandler:
     #
     #     return output_file
     @staticmethod
-    def write_excel(df, output_file, sheet_name='Sheet1'):
+    def _write_formatted_sheet(workbook, sheet_name, df):
         """
-        Write a DataFrame to an Excel file with formatting.
+        Stream a DataFrame into a new sheet of a write-only workbook with formatting.
+
+        Resource rows (non-indented) are bold as the rows are written, and the Ecart
+        column gets conditional formatting filling positive values green and
+        negative values red.
 
         Args:
-            df (pandas.DataFrame): The data to write
-            output_file (str): Path where the output file will be saved
+            workbook (openpyxl.Workbook): A workbook created with write_only=True
             sheet_name (str): Name of the worksheet
+            df (pandas.DataFrame): The data to write
         """
-        # Create directory if it doesn't exist
-        output_dir = os.path.dirname(output_file)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        worksheet = workbook.create_sheet(title=sheet_name)
 
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name=sheet_name)
+        # Find the Ecart column index
+        ecart_col_idx = df.columns.get_loc('Ecart') if 'Ecart' in df.columns else None
+        has_ecart = ecart_col_idx is not None
 
-            # Get the workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets[sheet_name]
-
-            # Find the Ecart column index
-            ecart_col_idx = None
-            for idx, col_name in enumerate(df.columns):
-                if col_name == 'Ecart':
-                    ecart_col_idx = idx
-                    break
-
-            # Apply formatting for resource rows (non-indented) and Ecart column
-            for idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=len(df) + 1)):
-                cell_value = str(row[0].value) if row[0].value else ""
+        # Header row
+        header = []
+        for col_name in df.columns:
+            cell = WriteOnlyCell(worksheet, value=str(col_name))
+            cell.font = _BOLD_FONT
+            header.append(cell)
+        worksheet.append(header)
 
+        # Make resource rows (non-indented) bold while streaming rows
+        is_resource = _resource_row_mask(df)
+        for start in range(0, len(df), _WRITE_CHUNK_ROWS):
+            chunk = df.iloc[start:start + _WRITE_CHUNK_ROWS]
+            # Missing values become empty cells: replace them with None for the whole chunk at once
+            rows = chunk.astype(object).where(chunk.notna(), None).to_numpy().tolist()
+            for idx, values in enumerate(rows, start):
                 # Make resource rows bold
-                if not cell_value.startswith('    '):
-                    for cell in row:
-                        cell.font = Font(bold=True)
-
-                # Apply conditional formatting to Ecart column
-                if ecart_col_idx is not None and not cell_value.startswith('    '):
-                    # Skip resource rows for Ecart formatting (they don't have Ecart values)
+                if is_resource[idx]:
+                    bold_row = []
+                    for value in values:
+                        cell = WriteOnlyCell(worksheet, value=value)
+                        cell.font = _BOLD_FONT
+                        bold_row.append(cell)
+                    worksheet.append(bold_row)
                     continue
 
-                if ecart_col_idx is not None:
-                    ecart_cell = row[ecart_col_idx]
-                    if ecart_cell.value is not None and isinstance(ecart_cell.value, (int, float)):
-                        from openpyxl.styles import PatternFill
-                        if ecart_cell.value > 0:  # Positive value
-                            # Light green color (vert accentuation6 plus clair 60%)
-                            ecart_cell.fill = PatternFill(start_color="C6E0B4", end_color="C6E0B4", fill_type="solid")
-                        elif ecart_cell.value < 0:  # Negative value
-                            # Light red color (same grade but red)
-                            ecart_cell.fill = PatternFill(start_color="F8CBAD", end_color="F8CBAD", fill_type="solid")
+                worksheet.append(values)
 
-        return output_file
+        # Apply conditional formatting to Ecart column: one rule per sign, evaluated by Excel itself
+        # (resource rows have no Ecart value, so their empty cells never match)
+        if has_ecart and len(df):
+            col_letter = get_column_letter(ecart_col_idx + 1)
+            ecart_range = f"{col_letter}2:{col_letter}{len(df) + 1}"
+            worksheet.conditional_formatting.add(
+                ecart_range, CellIsRule(operator='greaterThan', formula=['0'], fill=_GREEN_FILL))
+            worksheet.conditional_formatting.add(
+                ecart_range, CellIsRule(operator='lessThan', formula=['0'], fill=_RED_FILL))
+
+    @staticmethod
+    def write_excel(df, output_file, sheet_name='Sheet1'):
+        """
+        Write a DataFrame to an Excel file with formatting.
+
+        Args:
+            df (pandas.DataFrame): The data to write
+            output_file (str): Path where the output file will be saved
+            sheet_name (str): Name of the worksheet
+        """
+        return ExcelHandler.write_multiple_sheets({sheet_name: df}, output_file)
 
     @staticmethod
-    def write_multiple_sheets(dfs_dict, output_file):
+    def write_multiple_sheets(dfs_dict, output_file, graphs_sheet=None, figures=None, ecart_sum=None):
         """
         Write multiple DataFrames to an Excel file, each in its own sheet, with formatting.
 
+        Rows are streamed to a write-only workbook and styled as they are
+        written, so no sheet is ever held in memory as a full cell grid.
+        Figures, when given, are written to their own sheet in the same pass
+        instead of reloading the saved file with add_graphs_sheet.
+
         Args:
             dfs_dict (dict): {sheet_name: DataFrame}
             output_file (str): Path where the output file will be saved
+            graphs_sheet (str or None): Name of the sheet holding the figures
+            figures (list or None): List of matplotlib Figure objects
+            ecart_sum (float or None): If provided, write this value below the last image
         """
         output_dir = os.path.dirname(output_file)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            for sheet_name, df in dfs_dict.items():
-                df.to_excel(writer, index=False, sheet_name=sheet_name)
-                workbook = writer.book
-                worksheet = writer.sheets[sheet_name]
-                # Find the Ecart column index
-                ecart_col_idx = None
-                for idx, col_name in enumerate(df.columns):
-                    if col_name == 'Ecart':
-                        ecart_col_idx = idx
-                        break
-                # Apply formatting for resource rows (non-indented) and Ecart column
-                for idx, row in enumerate(worksheet.iter_rows(min_row=2, max_row=len(df) + 1)):
-                    cell_value = str(row[0].value) if row[0].value else ""
-                    # Make resource rows bold
-                    if not cell_value.startswith('    '):
-                        for cell in row:
-                            cell.font = Font(bold=True)
-                    # Apply conditional formatting to Ecart column
-                    if ecart_col_idx is not None and not cell_value.startswith('    '):
-                        continue
-                    if ecart_col_idx is not None:
-                        ecart_cell = row[ecart_col_idx]
-                        if ecart_cell.value is not None and isinstance(ecart_cell.value, (int, float)):
-                            from openpyxl.styles import PatternFill
-                            if ecart_cell.value > 0:
-                                ecart_cell.fill = PatternFill(start_color="C6E0B4", end_color="C6E0B4", fill_type="solid")
-                            elif ecart_cell.value < 0:
-                                ecart_cell.fill = PatternFill(start_color="F8CBAD", end_color="F8CBAD", fill_type="solid")
+        workbook = Workbook(write_only=True)
+        for sheet_name, df in dfs_dict.items():
+            ExcelHandler._write_formatted_sheet(workbook, sheet_name, df)
+        # The PNG buffers must stay alive until the workbook is saved
+        buffers = ExcelHandler._render_figures(figures) if graphs_sheet and figures else None
+        if buffers:
+            ExcelHandler._write_graphs_sheet(workbook, graphs_sheet, buffers, ecart_sum)
+        workbook.save(output_file)
+
         return output_file
 
     @staticmethod
@@ -213,38 +419,65 @@ class ExcelHandler:
             figures (list): List of matplotlib Figure objects
             ecart_sum (float or None): If provided, write this value below the last image
         """
-        from openpyxl import load_workbook
-        from openpyxl.drawing.image import Image as XLImage
-        import tempfile
-        import os
+        buffers = ExcelHandler._render_figures(figures)
 
         # Load the workbook
         wb = load_workbook(output_file)
         # Remove existing sheet if present
         if sheet_name in wb.sheetnames:
             del wb[sheet_name]
-        ws = wb.create_sheet(title=sheet_name)
+        ExcelHandler._write_graphs_sheet(wb, sheet_name, buffers, ecart_sum)
+        wb.save(output_file)
+
+    @staticmethod
+    def _render_figures(figures):
+        """
+        Encode matplotlib figures as in-memory PNG buffers.
+
+        Args:
+            figures (list): List of matplotlib Figure objects
+
+        Returns:
+            list: One BytesIO buffer per figure
+        """
+        from io import BytesIO
+
+        buffers = []
+        for fig in figures:
+            buf = BytesIO()
+            fig.savefig(buf, format='png', bbox_inches='tight')
+            buf.seek(0)
+            buffers.append(buf)
+        return buffers
+
+    @staticmethod
+    def _write_graphs_sheet(workbook, sheet_name, buffers, ecart_sum=None):
+        """
+        Create a sheet with the PNG buffers aligned horizontally and the optional Ecart sum below the last one.
+
+        Works on regular and write-only workbooks alike.
+
+        Args:
+            workbook: The openpyxl workbook to add the sheet to
+            sheet_name (str): Name of the sheet to add
+            buffers (list): PNG buffers as returned by _render_figures
+            ecart_sum (float or None): If provided, write this value below the last image
+        """
+        from openpyxl.drawing.image import Image as XLImage
+
+        ws = workbook.create_sheet(title=sheet_name)
 
-        temp_files = []
         col_letters = ['A', 'K', 'U', 'AE', 'AO', 'AY']  # Add more if needed
         last_col = 'A'
-        for idx, fig in enumerate(figures):
-            tmpfile = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            fig.savefig(tmpfile.name, bbox_inches='tight')
-            tmpfile.flush()
-            img = XLImage(tmpfile.name)
+        for idx, buf in enumerate(buffers):
+            img = XLImage(buf)
             col = col_letters[idx] if idx < len(col_letters) else f'A{idx*10+1}'
             ws.add_image(img, f'{col}1')
             last_col = col
-            temp_files.append(tmpfile.name)
-            tmpfile.close()
-        # Write ecart sum below the last image if provided
+        # Write ecart sum below the last image if provided; rows are appended
+        # because write-only sheets have no random cell access
         if ecart_sum is not None:
-            ws[f'{last_col}27'] = f'somme ecart = {ecart_sum:.2f}'
-        wb.save(output_file)
-        # Now delete temp files
-        for fname in temp_files:
-            try:
-                os.unlink(fname)
-            except Exception:
-                pass
\ No newline at end of file
+            col, row = coordinate_from_string(f'{last_col}27')
+            for _ in range(row - 1):
+                ws.append([])
+            ws.append([None] * (column_index_from_string(col) - 1) + [f'somme ecart = {ecart_sum:.2f}'])
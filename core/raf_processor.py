@@ -1,8 +1,10 @@
 import pandas as pd
 import calendar
-from config.raf_rules import get_raf
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from openpyxl.chart import BarChart, Reference
+from config.raf_rules import get_raf_values
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
+
+# Month name -> month number, used to order the months of the RAF summary
+_MONTH_ORDER = {name: i for i, name in enumerate(calendar.month_name)}
 
 
 class RAFProcessor:
@@ -21,21 +23,13 @@ class RAFProcessor:
         Returns:
             pandas.DataFrame: DataFrame with added RAF column
         """
-        result_df = df.copy()
-
-        # Add RAF column with NaN values
-        result_df['RAF'] = None
-
-        # Calculate RAF for each row
-        for idx, row in result_df.iterrows():
-            connection_level = row.get('Niveau de connexion')
-            project_phase = row.get('Phase du projet')
+        if 'Niveau de connexion' not in df.columns or 'Phase du projet' not in df.columns:
+            return df.assign(RAF=None)
 
-            if connection_level and project_phase:
-                raf_value = get_raf(connection_level, project_phase)
-                result_df.at[idx, 'RAF'] = raf_value
+        # Gather the RAF values from the precomputed (level, phase) table in one vectorized pass
+        raf = get_raf_values(df['Niveau de connexion'], df['Phase du projet'])
 
-        return result_df
+        return df.assign(RAF=raf)
 
     @staticmethod
     def add_raf_to_workbook(workbook, deployments_df):
@@ -44,7 +38,9 @@ class RAFProcessor:
 
         Args:
             workbook: The openpyxl workbook to modify
-            deployments_df (pandas.DataFrame): DataFrame with RAF values
+            deployments_df (pandas.DataFrame): DataFrame with RAF values, one row per data row
+                of the sheet and in the same order (as read by ExcelHandler.read_excel_columns
+                with keep_blank_rows=True)
 
         Returns:
             openpyxl.Workbook: The modified workbook
@@ -56,11 +52,13 @@ class RAFProcessor:
         last_col = sheet.max_column + 1
         sheet.cell(row=1, column=last_col, value="RAF")
 
-        # Add RAF values
-        row_index = 2  # Start from row 2 (after header)
-        for raf_value in deployments_df['RAF'].values:
-            sheet.cell(row=row_index, column=last_col, value=raf_value)
-            row_index += 1
+        # Convert the column to plain Python values once (missing RAF -> empty cell)
+        raf = deployments_df['RAF']
+        raf_values = raf.astype(object).where(raf.notna(), None).tolist()
+
+        # Add RAF values, starting from row 2 (after header)
+        for row_index, raf_value in enumerate(raf_values, start=2):
+            sheet.cell(row=row_index, column=last_col).value = raf_value
 
         return workbook
 
@@ -85,73 +83,44 @@ class RAFProcessor:
 
         # Calculate weekly RAF data
         # Ensure Date de MEP is datetime
-        deployments_df = deployments_df.copy()
-        deployments_df['Date de MEP'] = pd.to_datetime(deployments_df['Date de MEP'], errors='coerce')
+        mep = deployments_df['Date de MEP']
+        if not pd.api.types.is_datetime64_any_dtype(mep):
+            mep = pd.to_datetime(mep, errors='coerce')
+        dated = deployments_df[mep.notna()]
+        mep = mep[mep.notna()]
+        dated = dated.assign(_year=mep.dt.year, _month=mep.dt.month,
+                             _week=mep.dt.isocalendar().week, _day=mep.dt.day)
+
+        # Aggregate RAF and day range per (year, month, week) in a single groupby
+        weekly = dated.groupby(['_year', '_month', '_week']).agg(
+            raf=('RAF', 'sum'),
+            days_min=('_day', 'min'),
+            days_max=('_day', 'max'),
+        )
+        weekly['month_raf'] = weekly.groupby(level=['_year', '_month'])['raf'].transform('sum')
 
-        # Create Year-Month groups first
+        # Skip months with zero RAF and only include weeks with non-zero RAF
+        weekly = weekly[(weekly['month_raf'] != 0) & (weekly['raf'] > 0)]
+
+        # Create Year-Month groups by walking the sorted index once
         year_month_groups = {}
-        for year in deployments_df['Date de MEP'].dt.year.dropna().unique():
-            year_data = deployments_df[deployments_df['Date de MEP'].dt.year == year]
-            months_in_year = {}
-
-            for month in year_data['Date de MEP'].dt.month.unique():
-                month_name = calendar.month_name[month]
-                month_data = year_data[year_data['Date de MEP'].dt.month == month]
-
-                # Calculate total RAF for the month
-                month_raf = month_data['RAF'].sum()
-
-                # Skip months with zero RAF
-                if month_raf == 0:
-                    continue
-
-                # Group by week of month
-                weeks_data = []
-                # Get week numbers and find min/max days for each week
-                week_groups = {}
-
-                for _, row in month_data.iterrows():
-                    if pd.notna(row['Date de MEP']):
-                        week_num = row['Date de MEP'].isocalendar()[1]
-                        day = row['Date de MEP'].day
-
-                        if week_num not in week_groups:
-                            week_groups[week_num] = {'days': [], 'raf': 0}
-
-                        week_groups[week_num]['days'].append(day)
-                        if pd.notna(row['RAF']):
-                            week_groups[week_num]['raf'] += row['RAF']
-
-                # Process each week to create formatted week entries
-                for week_num, week_data in week_groups.items():
-                    raf_value = week_data['raf']
-
-                    # Only include weeks with non-zero RAF
-                    if raf_value > 0:
-                        min_day = min(week_data['days']) if week_data['days'] else 0
-                        max_day = max(week_data['days']) if week_data['days'] else 0
-
-                        # Format as "Week X (03 to 07)"
-                        week_label = f"Week {week_num}"
-                        if min_day and max_day:
-                            if min_day == max_day:
-                                day_range = f"({min_day:02d})"
-                            else:
-                                day_range = f"({min_day:02d} to {max_day:02d})"
-                            week_label = f"{week_label} {day_range}"
-
-                        weeks_data.append((week_label, raf_value))
-
-                # Only add month if it has weeks with non-zero RAF
-                if weeks_data:
-                    months_in_year[month_name] = {
-                        'total_raf': month_raf,
-                        'weeks': weeks_data
-                    }
-
-            # Only add year if it has months with data
-            if months_in_year:
-                year_month_groups[year] = months_in_year
+        for (year, month, week_num), (raf_value, min_day, max_day, month_raf) in zip(
+                weekly.index, weekly.itertuples(index=False, name=None)):
+            # Format as "Week X (03 to 07)"
+            week_label = f"Week {week_num}"
+            if min_day and max_day:
+                if min_day == max_day:
+                    day_range = f"({min_day:02d})"
+                else:
+                    day_range = f"({min_day:02d} to {max_day:02d})"
+                week_label = f"{week_label} {day_range}"
+
+            months_in_year = year_month_groups.setdefault(year, {})
+            month_entry = months_in_year.setdefault(calendar.month_name[month], {
+                'total_raf': month_raf,
+                'weeks': []
+            })
+            month_entry['weeks'].append((week_label, raf_value))
 
         # Create a stylish report
         # Add title
@@ -183,6 +152,22 @@ class RAFProcessor:
             bottom=Side(style='medium')
         )
 
+        # Register the report styles once as named styles, so each cell takes a single style reference
+        left = Alignment(horizontal='left')
+        center = Alignment(horizontal='center')
+        named_styles = {
+            'raf_header': dict(font=header_font, fill=header_fill, border=medium_border, alignment=center),
+            'raf_year': dict(font=year_font, fill=header_fill, border=thin_border, alignment=left),
+            'raf_year_value': dict(fill=header_fill, border=thin_border),
+            'raf_month': dict(font=month_font, fill=total_fill, border=thin_border, alignment=left),
+            'raf_month_value': dict(font=month_font, fill=total_fill, border=thin_border, alignment=center),
+            'raf_week': dict(font=week_font, border=thin_border, alignment=left),
+            'raf_week_value': dict(font=week_font, border=thin_border, alignment=center),
+        }
+        for name, attributes in named_styles.items():
+            if name not in workbook.named_styles:
+                workbook.add_named_style(NamedStyle(name=name, **attributes))
+
         # Set column widths
         raf_sheet.column_dimensions['A'].width = 35  # Period column - wider for week ranges
         raf_sheet.column_dimensions['B'].width = 15  # RAF Value column
@@ -191,45 +176,24 @@ class RAFProcessor:
         current_row = 3
 
         # Table headers
-        raf_sheet.cell(row=current_row, column=1, value="Period").font = header_font
-        raf_sheet.cell(row=current_row, column=2, value="RAF Value").font = header_font
-        for col in range(1, 3):
-            raf_sheet.cell(row=current_row, column=col).fill = header_fill
-            raf_sheet.cell(row=current_row, column=col).border = medium_border
-            raf_sheet.cell(row=current_row, column=col).alignment = Alignment(horizontal='center')
+        raf_sheet.cell(row=current_row, column=1, value="Period").style = 'raf_header'
+        raf_sheet.cell(row=current_row, column=2, value="RAF Value").style = 'raf_header'
 
         current_row += 1
 
         # Add data by year, month, and week in a consolidated table
         for year, months in sorted(year_month_groups.items()):
             # Year row
-            year_cell = raf_sheet.cell(row=current_row, column=1, value=f"Year {int(year)}")
-            year_cell.font = year_font
-            year_cell.fill = header_fill
-            year_cell.alignment = Alignment(horizontal='left')
-            year_cell.border = thin_border
-
-            raf_sheet.cell(row=current_row, column=2).border = thin_border
-            raf_sheet.cell(row=current_row, column=2).fill = header_fill
+            raf_sheet.cell(row=current_row, column=1, value=f"Year {int(year)}").style = 'raf_year'
+            raf_sheet.cell(row=current_row, column=2).style = 'raf_year_value'
 
             current_row += 1
 
             # Add months and weeks
-            for month_name, month_data in sorted(months.items(),
-                                                 key=lambda x: list(calendar.month_name).index(x[0]) if x[
-                                                                                                            0] in calendar.month_name else 0):
+            for month_name, month_data in sorted(months.items(), key=lambda x: _MONTH_ORDER.get(x[0], 0)):
                 # Month row
-                month_cell = raf_sheet.cell(row=current_row, column=1, value=month_name)
-                raf_cell = raf_sheet.cell(row=current_row, column=2, value=month_data['total_raf'])
-
-                month_cell.font = month_font
-                raf_cell.font = month_font
-                month_cell.alignment = Alignment(horizontal='left')
-                raf_cell.alignment = Alignment(horizontal='center')
-                month_cell.border = thin_border
-                raf_cell.border = thin_border
-                month_cell.fill = total_fill
-                raf_cell.fill = total_fill
+                raf_sheet.cell(row=current_row, column=1, value=month_name).style = 'raf_month'
+                raf_sheet.cell(row=current_row, column=2, value=month_data['total_raf']).style = 'raf_month_value'
 
                 current_row += 1
 
@@ -239,16 +203,9 @@ class RAFProcessor:
                     if week_raf == 0:
                         continue
 
-                    week_cell = raf_sheet.cell(row=current_row, column=1,
-                                               value=f"  • {week_label}")  # Indent with bullet
-                    raf_cell = raf_sheet.cell(row=current_row, column=2, value=week_raf)
-
-                    week_cell.font = week_font
-                    raf_cell.font = week_font
-                    week_cell.alignment = Alignment(horizontal='left')
-                    raf_cell.alignment = Alignment(horizontal='center')
-                    week_cell.border = thin_border
-                    raf_cell.border = thin_border
+                    raf_sheet.cell(row=current_row, column=1,
+                                   value=f"  • {week_label}").style = 'raf_week'  # Indent with bullet
+                    raf_sheet.cell(row=current_row, column=2, value=week_raf).style = 'raf_week_value'
 
                     current_row += 1
 
@@ -1,5 +1,13 @@
 # gui/__init__.py
 
+import os
+import sys
+
+# Add project root to sys.path once, before any submodule imports from core/config
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
 from gui.app import run_app
 
 __all__ = ['run_app']
\ No newline at end of file
@@ -1,7 +1,7 @@
 # gui/app.py
 
 import sys
-import os
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
 
@@ -11,10 +11,6 @@ from gui.styles import STYLESHEET
 
 def run_app():
     """Run the GUI application"""
-    # Add project root to sys.path to allow importing from project modules
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    sys.path.insert(0, project_root)
-
     # Create application
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Use Fusion style for consistent cross-platform look
@@ -31,4 +27,6 @@ def run_app():
 
 
 if __name__ == "__main__":
+    # Required for the worker process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     run_app()
\ No newline at end of file
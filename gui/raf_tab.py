@@ -1,88 +1,98 @@
 # gui/raf_tab.py
 
-import os
 import traceback
-import shutil
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QProgressBar, QSpacerItem, QSizePolicy,
                              QCheckBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
 from gui.widgets import FileSelector, StatusPanel
-from gui.utils import show_error, get_default_output_path, open_file, show_question
+from gui.utils import show_error, get_default_output_path, open_file, show_question, run_in_process
 
-# Import core functionality
-import sys
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import core functionality (the project root is put on sys.path by gui/__init__.py)
 from core.excel_handler import ExcelHandler
 from core.data_processor import DataProcessor
 from core.raf_processor import RAFProcessor
 from openpyxl import load_workbook
 
 
-class RAFWorker(QThread):
-    """Worker thread for RAF processing to keep UI responsive"""
-    progress_update = pyqtSignal(str)
-    finished_signal = pyqtSignal(bool, str, str)
+def _raf_job(deployments_file, output_file, progress):
+    """
+    Add the RAF column and summary sheet to a deployments file.
 
-    def __init__(self, deployments_file, output_file=None):
-        super().__init__()
-        self.deployments_file = deployments_file
-        self.output_file = output_file
+    Executed in the shared worker process: the arguments and the returned tuple are pickled.
 
-    def run(self):
-        try:
-            # Read the deployments Excel file
-            self.progress_update.emit(f"Reading deployments data...")
-            deployments_df = ExcelHandler.read_excel(self.deployments_file)
+    Args:
+        deployments_file (str): Path to the deployments Excel file
+        output_file (str or None): Path of the output file, derived from the input if empty
+        progress: Queue receiving progress messages
+
+    Returns:
+        tuple: (bool, str, str, str) - Success status, message, output file path and
+            error details (the traceback, empty on success)
+    """
+    try:
+        # Read the values of the columns the RAF computation and summary use (formula cells give
+        # their cached values); blank rows are kept so each DataFrame row matches its sheet row
+        progress.put(f"Reading deployments data...")
+        required_columns = ['Niveau de connexion', 'Phase du projet', 'Date de MEP']
+        deployments_df = ExcelHandler.read_excel_columns(deployments_file, required_columns, keep_blank_rows=True)
+
+        # Validate the required columns
+        progress.put("Validating input data...")
+        is_valid, missing_columns = DataProcessor.validate_dataframe(deployments_df, required_columns)
 
-            # Validate the required columns
-            self.progress_update.emit("Validating input data...")
-            required_columns = ['Niveau de connexion', 'Phase du projet', 'Date de MEP']
-            is_valid, missing_columns = DataProcessor.validate_dataframe(deployments_df, required_columns)
+        if not is_valid:
+            error_msg = f"The following required columns are missing: {missing_columns}"
+            return False, error_msg, "", ""
 
-            if not is_valid:
-                error_msg = f"The following required columns are missing: {missing_columns}"
-                self.finished_signal.emit(False, error_msg, "")
-                return
+        # The full workbook is only loaded to be modified and saved as the output file
+        workbook = load_workbook(deployments_file)
 
-            # Calculate RAF
-            self.progress_update.emit("Calculating RAF values...")
-            deployments_df = RAFProcessor.calculate_raf(deployments_df)
+        # Calculate RAF
+        progress.put("Calculating RAF values...")
+        deployments_df = RAFProcessor.calculate_raf(deployments_df)
 
-            # Get output file path if not specified
-            if not self.output_file:
-                self.output_file = get_default_output_path(self.deployments_file, "_with_raf")
+        # Get output file path if not specified
+        if not output_file:
+            output_file = get_default_output_path(deployments_file, "_with_raf")
 
-            # Copy the original file first to preserve all formatting and data
-            self.progress_update.emit("Creating output file...")
-            try:
-                shutil.copy2(self.deployments_file, self.output_file)
-            except shutil.SameFileError:
-                pass  # Ignore if source and destination are the same
+        # Add RAF column
+        progress.put("Adding RAF column to deployments data...")
+        workbook = RAFProcessor.add_raf_to_workbook(workbook, deployments_df)
 
-            # Use openpyxl to modify the file
-            self.progress_update.emit("Adding RAF column to deployments data...")
-            workbook = load_workbook(self.output_file)
+        # Create RAF summary sheet
+        progress.put("Creating RAF summary sheet...")
+        workbook = RAFProcessor.create_raf_summary_sheet(workbook, deployments_df)
 
-            # Add RAF column
-            workbook = RAFProcessor.add_raf_to_workbook(workbook, deployments_df)
+        # Save the workbook
+        progress.put("Saving workbook...")
+        workbook.save(output_file)
 
-            # Create RAF summary sheet
-            self.progress_update.emit("Creating RAF summary sheet...")
-            workbook = RAFProcessor.create_raf_summary_sheet(workbook, deployments_df)
+        return True, "RAF calculation completed successfully!", output_file, ""
 
-            # Save the workbook
-            self.progress_update.emit("Saving workbook...")
-            workbook.save(self.output_file)
+    except Exception as e:
+        # The GUI has no console, so the traceback travels back with the message
+        return False, f"An error occurred: {str(e)}", "", traceback.format_exc()
 
-            self.finished_signal.emit(True, "RAF calculation completed successfully!", self.output_file)
 
+class RAFWorker(QThread):
+    """Worker thread for RAF processing to keep UI responsive"""
+    progress_update = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str, str, str)
+
+    def __init__(self, deployments_file, output_file=None):
+        super().__init__()
+        self.deployments_file = deployments_file
+        self.output_file = output_file
+
+    def run(self):
+        try:
+            success, message, output_file, details = run_in_process(
+                _raf_job, (self.deployments_file, self.output_file), self.progress_update.emit)
         except Exception as e:
-            error_msg = f"An error occurred: {str(e)}"
-            traceback_str = traceback.format_exc()
-            self.finished_signal.emit(False, f"{error_msg}\n\nDetails:\n{traceback_str}", "")
+            success, message, output_file, details = False, f"An error occurred: {str(e)}", "", traceback.format_exc()
+        self.finished_signal.emit(success, message, output_file, details)
 
 
 class RAFTab(QWidget):
@@ -165,7 +175,7 @@ class RAFTab(QWidget):
         """Update progress status with message"""
         self.status_panel.set_status(message, "info")
 
-    def on_processing_finished(self, success, message, output_file):
+    def on_processing_finished(self, success, message, output_file, details):
         """Handle completion of the RAF processing"""
         # Re-enable controls
         self.setEnabled(True)
@@ -180,4 +190,7 @@ class RAFTab(QWidget):
             if self.open_after_checkbox.isChecked():
                 open_file(output_file)
         else:
-            self.status_panel.set_status(message, "error")
\ No newline at end of file
+            self.status_panel.set_status(message, "error")
+            # The traceback, when there is one, stays behind the box's "Show Details..." button
+            if details:
+                show_error(self, "Error", message, details)
\ No newline at end of file
@@ -1,6 +1,5 @@
 # gui/resource_tab.py
 
-import os
 import traceback
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QProgressBar, QSpacerItem, QSizePolicy,
@@ -8,29 +7,204 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
 from gui.widgets import FileSelector, StatusPanel
-from gui.utils import show_error, get_default_output_path, open_file, show_question
+from gui.utils import show_error, get_default_output_path, open_file, show_question, run_in_process
 
+import numpy as np
 import pandas as pd
+import matplotlib
+# Charts are only rendered to PNG for the workbook, never shown on screen
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
 
-# Import core functionality
-import sys
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import core functionality (the project root is put on sys.path by gui/__init__.py)
 from core.excel_handler import ExcelHandler
 from core.data_processor import DataProcessor
 
 
+def _resource_summary_job(input_file, deployments_file, output_file, phases_checked, columns, progress):
+    """
+    Generate the resource summary workbook with its High CA and graphs sheets.
+
+    Called by ResourceSummaryWorker through run_in_process.
+
+    Args:
+        input_file (str): Path to the consumption Excel file
+        deployments_file (str): Path to the deployments Excel file
+        output_file (str or None): Path of the output file, derived from the input if empty
+        phases_checked (frozenset): Project phases to keep in the summary
+        columns (list or None): Columns to drop from the summary
+        progress: Queue receiving progress messages
+
+    Returns:
+        tuple: (bool, str, str, str) - Success status, message, output file path and
+            error details (the traceback, empty on success)
+    """
+    try:
+        # Validate the required columns from the header alone, before parsing any file
+        progress.put("Validating input data...")
+        required_columns = ['Ressource', 'Projet', 'Soumise (h)']
+        header = ExcelHandler.peek_header(input_file)
+        missing_columns = [col for col in required_columns if col not in header]
+
+        if missing_columns:
+            error_msg = f"The following required columns are missing: {missing_columns}"
+            return False, error_msg, "", ""
+
+        # Read the input Excel files; files unchanged since a previous run are loaded from the parse cache
+        progress.put("Reading data from input file...")
+        df = ExcelHandler.cached_read(ExcelHandler.read_excel, input_file, usecols=required_columns)
+
+        progress.put("Reading deployments data...")
+        deployments_df = ExcelHandler.cached_read(ExcelHandler.read_excel_columns, deployments_file,
+                                                  ResourceSummaryWorker.DEPLOYMENT_COLUMNS)
+
+        # Fix column names if needed (Resource vs Ressource)
+        if 'Ressource' not in df.columns and 'Resource' in df.columns:
+            df.rename(columns={'Resource': 'Ressource'}, inplace=True)
+
+        # Create the project lookup table in one pass over the deployments, plus the small
+        # dictionaries format_resource_summary expects
+        progress.put("Creating lookup tables for project information...")
+        lookup_columns = ['Niveau de connexion', 'Phase du projet', 'Montant total (Contrat) (Commande)']
+        lookup = DataProcessor.create_project_lookup(
+            deployments_df, lookup_columns, last_row_columns=['Dernière Note', "Date d'affectation"])
+        connection_dict, phase_dict, montant_dict = (
+            lookup[col].dropna().to_dict() if col in lookup.columns else {} for col in lookup_columns)
+
+        # Calculate Charge JH
+        progress.put("Calculating 'Charge JH'...")
+        df = DataProcessor.calculate_charge_jh(df)
+
+        # Only projects in a checked phase reach the summary, so leave the others out of the pivot.
+        # Resource totals are taken on the full data first (over the rows the pivot would keep):
+        # they decide which resource rows are kept below, exactly as without the pre-filter
+        resource_totals = df.dropna(subset=['Projet']).groupby('Ressource')['Charge JH'].sum()
+        # The phase test runs once per distinct project and is gathered back through the factorize codes;
+        # rows without a project (code -1) pick the trailing True and are left for the pivot to drop
+        project_codes, projects = pd.factorize(df['Projet'])
+        project_kept = projects.map(phase_dict).fillna('').isin(phases_checked)
+        df = df[np.append(project_kept, True)[project_codes]]
+
+        # Create pivot table
+        progress.put("Creating pivot table...")
+        # Left unsorted: format_resource_summary orders the rows by resource and project
+        pivot_df = ExcelHandler.create_pivot_table(df, 'Charge JH', ['Ressource', 'Projet'], sort=False)
+        # Add Montant, Dernière Note and Durée (only when that column is not dropped below)
+        pivot_df = DataProcessor.add_project_details(pivot_df, lookup, with_duree=columns is None)
+
+        # Format the resource summary with theoretical charge
+        progress.put("Formatting output data and calculating theoretical charges...")
+        result_df = DataProcessor.format_resource_summary(pivot_df, connection_dict, phase_dict, montant_dict,
+                                                       resource_totals=resource_totals)
+
+        # Get output file path if not specified
+        if not output_file:
+            output_file = get_default_output_path(input_file, "_resource_summary")
+
+        # Detect consultant rows (they have a value in "Somme de Charge JH" and NaN in "Charge JH")
+        charge = result_df["Charge JH"].to_numpy(dtype=np.float64, na_value=np.nan)
+        somme = result_df["Somme de Charge JH"].to_numpy(dtype=np.float64, na_value=np.nan)
+        is_consultant = np.isnan(charge) & ~np.isnan(somme)
+
+        # Keep projects in a checked phase and consultants with a non-zero total
+        # (boolean indexing keeps the row order, so no re-sort is needed)
+        mask = result_df["Phase du projet"].isin(phases_checked).to_numpy() | (~np.isnan(somme) & (somme != 0))
+
+        # Recalculate the consultant sums from their remaining projects (0 when none is left).
+        # The blocks are taken before masking, where each consultant row starts its block of projects:
+        # a consultant row can be masked out while its projects stay, and after masking those would
+        # fall into the previous block. One reduceat over the block starts sums every block, with the
+        # masked rows and the consultant rows themselves adding 0 (their Charge JH is NaN)
+        block_starts = np.flatnonzero(is_consultant)
+        kept_charge = np.where(mask, np.nan_to_num(charge), 0.0)
+        block_sums = np.add.reduceat(kept_charge, block_starts) if block_starts.size else np.empty(0)
+
+        result_df = result_df.loc[mask].reset_index(drop=True)
+        is_consultant = is_consultant[mask]
+        result_df.loc[is_consultant, "Somme de Charge JH"] = block_sums[mask[block_starts]]
+        # Consultant row labels, reused by the bar chart
+        consultant_rows = result_df.index[is_consultant]
+
+        # Total Ecart, written to the 'Meta' sheet and below the graphs
+        ecart_sum = result_df['Ecart'].sum()
+
+        if columns is not None:
+            result_df = result_df.drop(columns=columns)
+
+        # Create High CA sheet (projects with Montant total (Contrat) (Commande) > 3000)
+        if 'Montant total (Contrat) (Commande)' in result_df.columns:
+            # One numpy comparison on the raw values (NaN compares False), then a positional take
+            montant = result_df['Montant total (Contrat) (Commande)'].to_numpy(dtype=np.float64, na_value=np.nan)
+            high_ca_df = result_df.iloc[np.flatnonzero(montant > 3000)]
+        else:
+            high_ca_df = result_df.iloc[0:0].copy()  # empty if column missing
+
+        # Generate graphs for the 'graphes' sheet
+        figures = []
+        # Bar chart: Charge JH par consultant
+        col_proj = 'Resource/ PROJET'
+        col_jh = 'Somme de Charge JH'
+        # Only use consultant rows (the non-indented ones) where 'Somme de Charge JH' is notna
+        chart_data = result_df.loc[consultant_rows, [col_proj, col_jh]]
+        chart_data = chart_data[chart_data[col_jh].notna()]
+        if not chart_data.empty:
+            fig1, ax1 = plt.subplots(figsize=(6, 3))
+            ax1.bar(chart_data[col_proj].astype(str), chart_data[col_jh])
+            ax1.set_xlabel("Consultants")
+            ax1.set_ylabel(col_jh)
+            ax1.set_title("Charge JH par consultant")
+            plt.xticks(rotation=45, ha="right")
+            figures.append(fig1)
+        # Pie chart: Distribution de l'ecarts
+        col_ecart = 'Ecart'
+        if col_ecart in result_df.columns:
+            ecart = result_df[col_ecart].dropna().to_numpy(dtype=np.float64)
+            if ecart.size:
+                # Count negative / zero / positive values in one pass: np.sign + 1 maps them to 0 / 1 / 2
+                negative, zero, positive = np.bincount(np.sign(ecart).astype(np.int8) + 1, minlength=3)
+                categories = [positive, negative, zero]
+                labels = ["Positive", "Negative", "Zero"]
+                fig2, ax2 = plt.subplots()
+                ax2.pie(categories, labels=labels, autopct="%1.1f%%", startangle=90)
+                ax2.set_title("Distribution de l'ecarts")
+                figures.append(fig2)
+
+        # Write the data sheets and the graphs in a single streaming pass
+        progress.put(f"Writing results to '{output_file}'...")
+        try:
+            ExcelHandler.write_multiple_sheets({
+                'Resource Summary': result_df,
+                'High CA': high_ca_df,
+                'Meta': pd.DataFrame({'somme ecart': [ecart_sum]})
+            }, output_file, graphs_sheet='graphes', figures=figures, ecart_sum=ecart_sum)
+        finally:
+            # Release the figures so pyplot does not keep them alive across runs
+            for fig in figures:
+                plt.close(fig)
+
+        return True, "Resource summary generated successfully!", output_file, ""
+
+    except Exception as e:
+        # The GUI has no console, so the traceback travels back with the message
+        return False, f"An error occurred: {str(e)}", "", traceback.format_exc()
+
+
 class ResourceSummaryWorker(QThread):
     """Worker thread for resource summary generation to keep UI responsive"""
     progress_update = pyqtSignal(str)
-    finished_signal = pyqtSignal(bool, str, str)
+    finished_signal = pyqtSignal(bool, str, str, str)
+
+    # Deployments columns used to build the summary; the rest of the file is never loaded
+    DEPLOYMENT_COLUMNS = ['Nom', 'Niveau de connexion', 'Phase du projet',
+                          'Montant total (Contrat) (Commande)', 'Dernière Note', "Date d'affectation"]
 
     def __init__(self, input_file, deployments_file, output_file=None,phases_checked=None,columns=None):
         super().__init__()
         self.input_file = input_file
         self.deployments_file = deployments_file
         self.output_file = output_file
-        self.phases_checked = phases_checked
+        # Hashed once here; both phase filters of the job test membership against it
+        self.phases_checked = frozenset(phases_checked or ())
         if columns == []:
             self.columns = None
         else:
@@ -38,175 +212,26 @@ class ResourceSummaryWorker(QThread):
 
     def run(self):
         try:
-            # Read the input Excel files
-            self.progress_update.emit("Reading data from input file...")
-            df = ExcelHandler.read_excel(self.input_file)
-
-            self.progress_update.emit("Reading deployments data...")
-            deployments_df = ExcelHandler.read_excel(self.deployments_file)
-
-            # Validate the required columns
-            self.progress_update.emit("Validating input data...")
-            required_columns = ['Ressource', 'Projet', 'Soumise (h)']
-            is_valid, missing_columns = DataProcessor.validate_dataframe(df, required_columns)
-
-            if not is_valid:
-                error_msg = f"The following required columns are missing: {missing_columns}"
-                self.finished_signal.emit(False, error_msg, "")
-                return
-
-            # Fix column names if needed (Resource vs Ressource)
-            if 'Ressource' not in df.columns and 'Resource' in df.columns:
-                df.rename(columns={'Resource': 'Ressource'}, inplace=True)
-
-            # Create lookup dictionaries
-            self.progress_update.emit("Creating lookup tables for project information...")
-            connection_dict = DataProcessor.create_connection_dict(deployments_df, 'Niveau de connexion')
-            phase_dict = DataProcessor.create_connection_dict(deployments_df, 'Phase du projet')
-            montant_dict = DataProcessor.create_connection_dict(deployments_df, 'Montant total (Contrat) (Commande)')
-
-            # Add Dernière Note mapping if present
-            derniere_note_dict = {}
-            if 'Dernière Note' in deployments_df.columns and 'Nom' in deployments_df.columns:
-                derniere_note_dict = deployments_df.set_index('Nom')['Dernière Note'].to_dict()
-
-            # Calculate Charge JH
-            self.progress_update.emit("Calculating 'Charge JH'...")
-            df = DataProcessor.calculate_charge_jh(df)
-
-            # Create pivot table
-            self.progress_update.emit("Creating pivot table...")
-            pivot_df = ExcelHandler.create_pivot_table(df, 'Charge JH', ['Ressource', 'Projet'])
-            # Add CA column to pivot_df by mapping project to summed CA
-            pivot_df['Montant total (Contrat) (Commande)'] = pivot_df['Projet'].map(montant_dict)
-            # Add Dernière Note column to pivot_df by mapping project
-            if derniere_note_dict:
-                pivot_df['Dernière Note'] = pivot_df['Projet'].map(derniere_note_dict)
-            if self.columns is None:
-                # Calculate Durée (days between today and Date d'affectation)
-                if "Date d'affectation" in deployments_df.columns and "Nom" in deployments_df.columns:
-                    date_affect_dict = deployments_df.set_index("Nom")["Date d'affectation"].to_dict()
-                    today = pd.Timestamp.now().normalize()
-                    duree_list = []
-                    for project in pivot_df["Projet"]:
-                        date_affect = pd.to_datetime(date_affect_dict.get(project, pd.NaT), errors="coerce")
-                        if pd.notna(date_affect):
-                            duree = (today - date_affect.normalize()).days
-                        else:
-                            duree = None
-                        duree_list.append(duree)
-                    pivot_df["Durée"] = duree_list
-                else:
-                    pivot_df["Durée"] = None
-            else:
-                pivot_df["Durée"] = None
-
-            # Format the resource summary with theoretical charge
-            self.progress_update.emit("Formatting output data and calculating theoretical charges...")
-            result_df = DataProcessor.format_resource_summary(pivot_df, connection_dict, phase_dict, montant_dict)
-
-            # Get output file path if not specified
-            if not self.output_file:
-                self.output_file = get_default_output_path(self.input_file, "_resource_summary")
-
-            # Detect consultant rows (they have a value in "Somme de Charge JH" and NaN in "Charge JH")
-            result_df["is_consultant"] = result_df["Charge JH"].isna() & result_df["Somme de Charge JH"].notna()
-
-            # Add a group ID to each consultant block
-            result_df["consultant_id"] = result_df["Resource/ PROJET"].where(result_df["is_consultant"]).ffill()
-
-            result_df["__original_order"] = range(len(result_df))
-            result_df = result_df[
-                result_df["Phase du projet"].isin(self.phases_checked) |
-                result_df["Somme de Charge JH"].notna() & (result_df["Somme de Charge JH"] != 0)
-                ]
-            result_df = result_df.sort_values("__original_order").drop(columns="__original_order")
-
-            # Drop consultant rows temporarily
-            projects_only = result_df[~result_df["is_consultant"]].copy()
-
-            # Recalculate sums
-            sums = projects_only.groupby("consultant_id")["Charge JH"].sum().reset_index()
-            sums.columns = ["consultant_id", "new_sum"]
-
-            # Ensure every consultant has a row in the sums (even if 0)
-            all_consultants = result_df[result_df["is_consultant"]][["consultant_id"]].drop_duplicates()
-            sums = all_consultants.merge(sums, on="consultant_id", how="left").fillna(0)
-            sums = sums.infer_objects(copy=False)
-
-            # Merge back the recalculated sum into the original DataFrame
-            result_df = result_df.merge(sums, on="consultant_id", how="left")
-
-            # Update consultant rows only
-            result_df.loc[result_df["is_consultant"], "Somme de Charge JH"] = result_df.loc[result_df["is_consultant"], "new_sum"]
-
-            # Clean up
-            result_df = result_df.drop(columns=["is_consultant", "new_sum", "consultant_id"])
-
-            # Add a value to a specific cell (e.g., 'col2' in 'row2')
-            result_df.loc[0, 'somme ecart'] = result_df['Ecart'].sum()
-
-            if self.columns is not None:
-                result_df = result_df.drop(columns=self.columns)
-
-            # Write to Excel
-            self.progress_update.emit(f"Writing results to '{self.output_file}'...")
-            # Create High CA sheet (projects with Montant total (Contrat) (Commande) > 3000)
-            if 'Montant total (Contrat) (Commande)' in result_df.columns:
-                high_ca_df = result_df[result_df['Montant total (Contrat) (Commande)'] > 3000]
-            else:
-                high_ca_df = result_df.iloc[0:0].copy()  # empty if column missing
-            ExcelHandler.write_multiple_sheets({
-                'Resource Summary': result_df,
-                'High CA': high_ca_df
-            }, self.output_file)
-
-            # Generate graphs and add to 'graphes' sheet
-            import matplotlib.pyplot as plt
-            figures = []
-            # Bar chart: Charge JH par consultant
-            col_proj = 'Resource/ PROJET'
-            col_jh = 'Somme de Charge JH'
-            # Only use rows where 'Somme de Charge JH' is notna and 'Resource/ PROJET' is not indented
-            chart_data = result_df[(result_df[col_jh].notna()) & (~result_df[col_proj].str.startswith('    '))]
-            if not chart_data.empty:
-                fig1, ax1 = plt.subplots(figsize=(6, 3))
-                ax1.bar(chart_data[col_proj].astype(str), chart_data[col_jh])
-                ax1.set_xlabel("Consultants")
-                ax1.set_ylabel(col_jh)
-                ax1.set_title("Charge JH par consultant")
-                plt.xticks(rotation=45, ha="right")
-                figures.append(fig1)
-            # Pie chart: Distribution de l'ecarts
-            col_ecart = 'Ecart'
-            if col_ecart in result_df.columns:
-                ecart = result_df[col_ecart].dropna()
-                if not ecart.empty:
-                    categories = [
-                        (ecart > 0).sum(),
-                        (ecart < 0).sum(),
-                        (ecart == 0).sum(),
-                    ]
-                    labels = ["Positive", "Negative", "Zero"]
-                    fig2, ax2 = plt.subplots()
-                    ax2.pie(categories, labels=labels, autopct="%1.1f%%", startangle=90)
-                    ax2.set_title("Distribution de l'ecarts")
-                    figures.append(fig2)
-            if figures:
-                ecart_sum = result_df['Ecart'].sum() if 'Ecart' in result_df.columns else None
-                ExcelHandler.add_graphs_sheet(self.output_file, 'graphes', figures, ecart_sum=ecart_sum)
-
-            self.finished_signal.emit(True, "Resource summary generated successfully!", self.output_file)
-
+            success, message, output_file, details = run_in_process(
+                _resource_summary_job,
+                (self.input_file, self.deployments_file, self.output_file, self.phases_checked, self.columns),
+                self.progress_update.emit)
         except Exception as e:
-            error_msg = f"An error occurred: {str(e)}"
-            traceback_str = traceback.format_exc()
-            self.finished_signal.emit(False, f"{error_msg}\n\nDetails:\n{traceback_str}", "")
+            success, message, output_file, details = False, f"An error occurred: {str(e)}", "", traceback.format_exc()
+        self.finished_signal.emit(success, message, output_file, details)
 
 
 class ResourceSummaryTab(QWidget):
     """Tab for generating resource summary with theoretical charge"""
 
+    # Selectable project phases as (label, checked by default), one tuple per layout column
+    _PHASE_COLUMNS = (
+        (("Cadrage / spécification", True), ("Développement", True), ("Non démarré (nouveau projet)", True)),
+        (("Recette interne", True), ("Recette utilisateur", True), ("Pré-production", True)),
+        (("Projet arrêté définitivement", False), ("Projet en pause", False), ("En production (VSR)", False)),
+        (("Non démarré (autre lot)", False), ("Terminé (VSR signée)", False)),
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.worker = None
@@ -246,64 +271,15 @@ class ResourceSummaryTab(QWidget):
 
         checkbox_layout = QHBoxLayout()
 
-        checkbox_layout1 = QVBoxLayout()
-        checkbox_layout2 = QVBoxLayout()
-        checkbox_layout3 = QVBoxLayout()
-        checkbox_layout4 = QVBoxLayout()
-
-        self.cadrage_checkbox = QCheckBox("Cadrage / spécification")
-        self.cadrage_checkbox.setChecked(True)
-        checkbox_layout1.addWidget(self.cadrage_checkbox)
-
-        self.developpement_checkbox = QCheckBox("Développement")
-        self.developpement_checkbox.setChecked(True)
-        checkbox_layout1.addWidget(self.developpement_checkbox)
-
-        self.non_demarre_checkbox = QCheckBox("Non démarré (nouveau projet)")
-        self.non_demarre_checkbox.setChecked(True)
-        checkbox_layout1.addWidget(self.non_demarre_checkbox)
-
-        checkbox_layout.addLayout(checkbox_layout1)
-
-        self.recette_interne_checkbox = QCheckBox("Recette interne")
-        self.recette_interne_checkbox.setChecked(True)
-        checkbox_layout2.addWidget(self.recette_interne_checkbox)
-
-        self.recette_user_checkbox = QCheckBox("Recette utilisateur")
-        self.recette_user_checkbox.setChecked(True)
-        checkbox_layout2.addWidget(self.recette_user_checkbox)
-
-        self.preprod_checkbox = QCheckBox("Pré-production")
-        self.preprod_checkbox.setChecked(True)
-        checkbox_layout2.addWidget(self.preprod_checkbox)
-
-        checkbox_layout.addLayout(checkbox_layout2)
-
-        self.arrete_checkbox = QCheckBox("Projet arrêté définitivement")
-        self.arrete_checkbox.setChecked(False)
-        checkbox_layout3.addWidget(self.arrete_checkbox)
-
-        self.pause_checkbox = QCheckBox("Projet en pause")
-        self.pause_checkbox.setChecked(False)
-        checkbox_layout3.addWidget(self.pause_checkbox)
-
-        self.production_checkbox = QCheckBox("En production (VSR)")
-        self.production_checkbox.setChecked(False)
-        checkbox_layout3.addWidget(self.production_checkbox)
-
-        checkbox_layout.addLayout(checkbox_layout3)
-
-        self.non_demarre_autre_lot_checkbox = QCheckBox("Non démarré (autre lot)")
-        self.non_demarre_autre_lot_checkbox.setChecked(False)
-        checkbox_layout4.addWidget(self.non_demarre_autre_lot_checkbox)
-
-        self.termine_checkbox = QCheckBox("Terminé (VSR signée)")
-        self.termine_checkbox.setChecked(False)
-        checkbox_layout4.addWidget(self.termine_checkbox)
-
-
-
-        checkbox_layout.addLayout(checkbox_layout4)
+        self._phase_checkboxes = {}
+        for phases in self._PHASE_COLUMNS:
+            column_layout = QVBoxLayout()
+            for label, checked in phases:
+                checkbox = QCheckBox(label)
+                checkbox.setChecked(checked)
+                column_layout.addWidget(checkbox)
+                self._phase_checkboxes[label] = checkbox
+            checkbox_layout.addLayout(column_layout)
 
         phase_layout.addLayout(checkbox_layout)
 
@@ -319,6 +295,8 @@ class ResourceSummaryTab(QWidget):
         self.duree_checkbox = QCheckBox("Durée")
         self.duree_checkbox.setChecked(False)
         duree_layout.addWidget(self.duree_checkbox)
+        # Optional output columns, dropped from the summary unless their checkbox is ticked
+        self._column_checkboxes = {"Durée": self.duree_checkbox}
 
         layout.addLayout(duree_layout)
 
@@ -376,7 +354,7 @@ class ResourceSummaryTab(QWidget):
         """Update progress status with message"""
         self.status_panel.set_status(message, "info")
 
-    def on_generation_finished(self, success, message, output_file):
+    def on_generation_finished(self, success, message, output_file, details):
         """Handle completion of the generation process"""
         # Re-enable controls
         self.setEnabled(True)
@@ -393,38 +371,15 @@ class ResourceSummaryTab(QWidget):
         else:
             print(message)
             self.status_panel.set_status(message, "error")
+            # The traceback, when there is one, stays behind the box's "Show Details..." button
+            if details:
+                show_error(self, "Error", message, details)
 
     def get_checked_phases(self):
         """"
         methode that returns a list containing the phases selected
         """
-        phases = [""]
-        if self.cadrage_checkbox.isChecked():
-            phases.append("Cadrage / spécification")
-        if self.developpement_checkbox.isChecked():
-            phases.append("Développement")
-        if self.production_checkbox.isChecked():
-            phases.append("En production (VSR)")
-        if self.non_demarre_autre_lot_checkbox.isChecked():
-            phases.append("Non démarré (autre lot)")
-        if self.non_demarre_checkbox.isChecked():
-            phases.append("Non démarré (nouveau projet)")
-        if self.preprod_checkbox.isChecked():
-            phases.append("Pré-production")
-        if self.arrete_checkbox.isChecked():
-            phases.append("Projet arrêté définitivement")
-        if self.pause_checkbox.isChecked():
-            phases.append("Projet en pause")
-        if self.recette_interne_checkbox.isChecked():
-            phases.append("Recette interne")
-        if self.recette_user_checkbox.isChecked():
-            phases.append("Recette utilisateur")
-        if self.termine_checkbox.isChecked():
-            phases.append("Terminé (VSR signée)")
-        return phases
+        return [""] + [label for label, checkbox in self._phase_checkboxes.items() if checkbox.isChecked()]
 
     def get_checked_columns(self):
-        columns=[]
-        if not self.duree_checkbox.isChecked():
-            columns.append("Durée")
-        return columns
+        return [column for column, checkbox in self._column_checkboxes.items() if not checkbox.isChecked()]
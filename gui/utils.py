@@ -1,25 +1,39 @@
 # gui/utils.py
 
 import os
-import sys
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from queue import Empty
 from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtCore import QUrl
 from PyQt5.QtGui import QDesktopServices
 
+# Shared worker process for CPU-bound jobs, created on first use
+_process_pool = None
+_process_manager = None
+_process_pool_lock = threading.Lock()
+# Minimum delay between two progress messages relayed to the UI, in seconds
+PROGRESS_INTERVAL = 0.2
 
-def show_message(parent, title, message, icon=QMessageBox.Information):
-    """Display a message box"""
+
+def show_message(parent, title, message, icon=QMessageBox.Information, details=None):
+    """Display a message box, with optional details shown on demand"""
     msg_box = QMessageBox(parent)
     msg_box.setWindowTitle(title)
     msg_box.setText(message)
     msg_box.setIcon(icon)
+    if details:
+        msg_box.setDetailedText(details)
     msg_box.setStandardButtons(QMessageBox.Ok)
     msg_box.exec_()
 
 
-def show_error(parent, title, message):
+def show_error(parent, title, message, details=None):
     """Display an error message box"""
-    show_message(parent, title, message, QMessageBox.Critical)
+    show_message(parent, title, message, QMessageBox.Critical, details)
 
 
 def show_warning(parent, title, message):
@@ -47,8 +61,64 @@ def get_default_output_path(input_file, suffix="_output"):
 
 
 def open_file(file_path):
-    """Open a file with the default system application"""
-    if sys.platform == 'win32':
-        os.startfile(file_path)
-    else:
-        QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
\ No newline at end of file
+    """Open a file with the default system application (returns immediately, the OS handles the launch)"""
+    QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
+
+
+def get_process_pool():
+    """Return the shared single-process pool and its queue manager, creating them on first use"""
+    global _process_pool, _process_manager
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawn rather than fork: forking a process that runs a Qt event loop is unsafe
+            context = multiprocessing.get_context('spawn')
+            _process_pool = ProcessPoolExecutor(max_workers=1, mp_context=context)
+            _process_manager = context.Manager()
+    return _process_pool, _process_manager
+
+
+def _reset_process_pool(pool):
+    """Drop a broken pool and its queue manager so the next get_process_pool() creates fresh ones"""
+    global _process_pool, _process_manager
+    with _process_pool_lock:
+        # Another thread may already have replaced it
+        if _process_pool is not pool:
+            return
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_manager.shutdown()
+        _process_pool = None
+        _process_manager = None
+
+
+def run_in_process(job, args, progress_callback):
+    """
+    Run job(*args, progress_queue) in the shared worker process and return its result.
+
+    Messages the job puts on the queue are passed to progress_callback from the
+    calling thread while the job runs, at most once per PROGRESS_INTERVAL: when
+    several arrive in between, only the newest is relayed. If the worker process
+    dies, BrokenProcessPool is raised and the pool is recreated on the next call.
+    """
+    pool, manager = get_process_pool()
+    try:
+        progress_queue = manager.Queue()
+        future = pool.submit(job, *args, progress_queue)
+        pending = None
+        last_emit = 0.0
+        while True:
+            try:
+                pending = progress_queue.get(timeout=PROGRESS_INTERVAL / 2)
+            except Empty:
+                # Every message is queued before the job returns, so an empty queue on a finished job means we are done
+                if future.done():
+                    break
+            now = time.monotonic()
+            if pending is not None and now - last_emit >= PROGRESS_INTERVAL:
+                progress_callback(pending)
+                pending, last_emit = None, now
+        return future.result()
+    except BrokenProcessPool:
+        # The worker process died (crash, killed, out of memory): the pool cannot run
+        # anything anymore, so replace it on the next run instead of failing forever
+        _reset_process_pool(pool)
+        raise
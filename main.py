@@ -1,9 +1,9 @@
 import os
 import sys
+import traceback
 import pandas as pd
 import warnings
-
-from config.raf_rules import get_raf
+from openpyxl import load_workbook
 
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
 
@@ -14,9 +14,15 @@ sys.path.insert(0, project_root)
 from core.excel_handler import ExcelHandler
 from core.data_processor import DataProcessor
 from core.deployment_processor import DeploymentProcessor
+from core.raf_processor import RAFProcessor
 from utils.helpers import get_user_file_path, get_default_output_path, get_user_choice
 
 
+# Deployments columns used by the resource summary; the rest of the file is never loaded
+DEPLOYMENT_COLUMNS = ['Nom', 'Niveau de connexion', 'Phase du projet',
+                      'Montant total (Contrat) (Commande)', 'Dernière Note', "Date d'affectation"]
+
+
 def display_menu():
     """Display main menu options."""
     print("\nExcel Resource Summary Generator")
@@ -36,37 +42,37 @@ def generate_resource_summary():
         # Get deployments file path from user
         deployments_file = get_user_file_path("\nEnter the path to your deployments Excel file: ")
 
-        # Read the input Excel files
-        print(f"\nReading data from '{input_file}'...")
-        df = ExcelHandler.read_excel(input_file)
-
-        print(f"Reading deployments data from '{deployments_file}'...")
-        deployments_df = ExcelHandler.read_excel(deployments_file)
-
-        # Validate the required columns
-        print("Validating input data...")
+        # Validate the required columns from the header alone, before parsing any file
+        print("\nValidating input data...")
         required_columns = ['Ressource', 'Projet', 'Soumise (h)']
-        is_valid, missing_columns = DataProcessor.validate_dataframe(df, required_columns)
+        header = ExcelHandler.peek_header(input_file)
+        missing_columns = [col for col in required_columns if col not in header]
 
-        if not is_valid:
+        if missing_columns:
             print(f"Error: The following required columns are missing: {missing_columns}")
-            print(f"Available columns: {df.columns.tolist()}")
+            print(f"Available columns: {header}")
             return
 
+        # Read only the columns the summary needs; the deployments are streamed in read-only mode
+        # when calamine is not installed
+        print(f"Reading data from '{input_file}'...")
+        df = ExcelHandler.read_excel(input_file, usecols=required_columns)
+
+        print(f"Reading deployments data from '{deployments_file}'...")
+        deployments_df = ExcelHandler.read_excel_columns(deployments_file, DEPLOYMENT_COLUMNS)
+
         # Fix column names if needed (Resource vs Ressource)
         if 'Ressource' not in df.columns and 'Resource' in df.columns:
             df.rename(columns={'Resource': 'Ressource'}, inplace=True)
 
-        # Create lookup dictionaries
+        # Create the project lookup table in one pass over the deployments, plus the small
+        # dictionaries format_resource_summary expects
         print("Creating lookup tables for project information...")
-        connection_dict = DataProcessor.create_connection_dict(deployments_df, 'Niveau de connexion')
-        phase_dict = DataProcessor.create_connection_dict(deployments_df, 'Phase du projet')
-        montant_dict = DataProcessor.create_connection_dict(deployments_df, 'Montant total (Contrat) (Commande)')
-        # Add this: create CA dictionary by summing CA by project
-        ca_dict = {}
-        if 'CA' in deployments_df.columns and 'Nom' in deployments_df.columns:
-            ca_by_project = deployments_df.groupby('Nom')['CA'].sum()
-            ca_dict = ca_by_project.to_dict()
+        lookup_columns = ['Niveau de connexion', 'Phase du projet', 'Montant total (Contrat) (Commande)']
+        lookup = DataProcessor.create_project_lookup(
+            deployments_df, lookup_columns, last_row_columns=['Dernière Note', "Date d'affectation"])
+        connection_dict, phase_dict, montant_dict = (
+            lookup[col].dropna().to_dict() if col in lookup.columns else {} for col in lookup_columns)
 
         # Calculate Charge JH
         print("Calculating 'Charge JH' (Soumise (h) / 8)...")
@@ -74,9 +80,10 @@ def generate_resource_summary():
 
         # Create pivot table
         print("Creating pivot table...")
-        pivot_df = ExcelHandler.create_pivot_table(df, 'Charge JH', ['Ressource', 'Projet'])
-        # Add CA column to pivot_df by mapping project to summed CA
-        pivot_df['CA'] = pivot_df['Projet'].map(ca_dict)
+        # Left unsorted: format_resource_summary orders the rows by resource and project
+        pivot_df = ExcelHandler.create_pivot_table(df, 'Charge JH', ['Ressource', 'Projet'], sort=False)
+        # Add Montant, Dernière Note and Durée, as the GUI summary does
+        pivot_df = DataProcessor.add_project_details(pivot_df, lookup)
 
         # Format the resource summary with theoretical charge
         print("Formatting output data and calculating theoretical charges...")
@@ -106,7 +113,6 @@ def generate_resource_summary():
 
     except Exception as e:
         print(f"\nAn error occurred: {str(e)}")
-        import traceback
         traceback.print_exc()
 
 
@@ -116,23 +122,26 @@ def add_raf_to_deployments():
         # Get deployments file path from user
         deployments_file = get_user_file_path("\nEnter the path to your deployments Excel file: ")
 
-        # Read the deployments Excel file
+        # Read the values of the columns the RAF computation and summary use (formula cells give
+        # their cached values); blank rows are kept so each DataFrame row matches its sheet row
         print(f"\nReading deployments data from '{deployments_file}'...")
-        deployments_df = ExcelHandler.read_excel(deployments_file)
+        required_columns = ['Niveau de connexion', 'Phase du projet', 'Date de MEP']
+        deployments_df = ExcelHandler.read_excel_columns(deployments_file, required_columns, keep_blank_rows=True)
 
         # Validate the required columns
         print("Validating input data...")
-        required_columns = ['Niveau de connexion', 'Phase du projet', 'Date de MEP']
         is_valid, missing_columns = DataProcessor.validate_dataframe(deployments_df, required_columns)
 
         if not is_valid:
             print(f"Error: The following required columns are missing: {missing_columns}")
-            print(f"Available columns: {deployments_df.columns.tolist()}")
+            print(f"Available columns: {ExcelHandler.peek_header(deployments_file)}")
             return
 
+        # The full workbook is only loaded to be modified and saved as the output file
+        workbook = load_workbook(deployments_file)
+
         # Calculate RAF
         print("Calculating RAF values based on connection level and project phase...")
-        from core.raf_processor import RAFProcessor
         deployments_df = RAFProcessor.calculate_raf(deployments_df)
 
         # Get output file path
@@ -148,28 +157,15 @@ def add_raf_to_deployments():
         # Write to Excel
         print(f"\nWriting results to '{output_file}'...")
 
-        # Copy the original file first to preserve all formatting and data
-        import shutil
-        try:
-            shutil.copy2(deployments_file, output_file)
-        except shutil.SameFileError:
-            pass  # Ignore if source and destination are the same
-
-        # Use openpyxl to modify the file
-        from openpyxl import load_workbook
-
-        # Load the workbook
-        print("Adding RAF column to deployments data...")
-        workbook = load_workbook(output_file)
-
         # Add RAF column
+        print("Adding RAF column to deployments data...")
         workbook = RAFProcessor.add_raf_to_workbook(workbook, deployments_df)
 
         # Create RAF summary sheet
         print("Creating RAF summary sheet with weekly and monthly breakdowns...")
         workbook = RAFProcessor.create_raf_summary_sheet(workbook, deployments_df)
 
-        # Save the workbook
+        # Save the workbook under the output path; the input file itself is never copied
         workbook.save(output_file)
 
         print(f"\nSuccess! Results saved to {output_file}")
@@ -182,7 +178,6 @@ def add_raf_to_deployments():
 
     except Exception as e:
         print(f"\nAn error occurred: {str(e)}")
-        import traceback
         traceback.print_exc()
 
 
@@ -12,6 +12,24 @@ def test_create_connection_dict():
     result = DataProcessor.create_connection_dict(df, 'Val')
     assert result == {'P1': 10, 'P2': 20}
 
+def test_create_project_lookup():
+    df = pd.DataFrame({'Nom': ['P1', 'P1'], 'Val': [10, None], 'Note': ['a', None]})
+    lookup = DataProcessor.create_project_lookup(df, ['Val'], last_row_columns=['Note'])
+    assert lookup.loc['P1', 'Val'] == 10
+    assert pd.isna(lookup.loc['P1', 'Note'])
+
+def test_add_project_details():
+    pivot_df = pd.DataFrame({'Ressource': ['R1', 'R1'], 'Projet': ['P1', 'P2'], 'Charge JH': [1.0, 2.0]})
+    lookup = pd.DataFrame({'Montant total (Contrat) (Commande)': [5000], 'Dernière Note': ['n1'],
+                           "Date d'affectation": [pd.Timestamp.now().normalize() - pd.Timedelta(days=3)]},
+                          index=pd.Index(['P1'], name='Nom'))
+    result = DataProcessor.add_project_details(pivot_df, lookup)
+    assert "Date d'affectation" not in result.columns
+    assert result['Montant total (Contrat) (Commande)'].tolist()[0] == 5000
+    assert str(result['Durée'].dtype) == 'Int32'
+    assert result['Durée'].iloc[0] == 3 and pd.isna(result['Durée'].iloc[1])
+    assert DataProcessor.add_project_details(pivot_df, lookup, with_duree=False)['Durée'].isna().all()
+
 def test_calculate_charge_jh():
     df = pd.DataFrame({'Soumise (h)': [8, 16]})
     result = DataProcessor.calculate_charge_jh(df)
@@ -24,4 +42,11 @@ def test_format_resource_summary():
     phase = {'P1': 'PH1'}
     montant = {'P1': 100}
     out = DataProcessor.format_resource_summary(df, conn, phase, montant)
-    assert isinstance(out, pd.DataFrame) 
\ No newline at end of file
+    assert isinstance(out, pd.DataFrame) 
+
+def test_format_resource_summary_resource_totals():
+    df = pd.DataFrame({'Ressource': ['R2'], 'Projet': ['P1'], 'Charge JH': [1.0], 'Montant total (Contrat) (Commande)': [100], 'Dernière Note': ['A'], 'Durée': [5]})
+    totals = pd.Series({'R1': 2.0, 'R2': 3.0})
+    out = DataProcessor.format_resource_summary(df, {}, {}, {}, resource_totals=totals)
+    assert out['Resource/ PROJET'].tolist() == ['R1', 'R2', '    P1']
+    assert out['Somme de Charge JH'].tolist()[:2] == [2.0, 3.0]
@@ -15,4 +15,11 @@ def test_calculate_raf():
 def test_calculate_monthly_raf():
     df = pd.DataFrame({'Date de MEP': ['2023-01-01'], 'RAF': [1]})
     out = DeploymentProcessor.calculate_monthly_raf(df)
-    assert 'Total RAF' in out.columns or out.empty 
\ No newline at end of file
+    assert 'Total RAF' in out.columns or out.empty 
+
+
+def test_calculate_raf_values():
+    df = pd.DataFrame({'Niveau de connexion': ['Semi Connexion', 'X'], 'Phase du projet': ['Développement', 'B']})
+    out = DeploymentProcessor.calculate_raf(df)
+    assert out['RAF'].iloc[0] == 3
+    assert pd.isna(out['RAF'].iloc[1])
@@ -2,6 +2,7 @@ import pytest
 import pandas as pd
 from core.excel_handler import ExcelHandler
 from unittest.mock import patch, MagicMock
+from openpyxl import load_workbook
 
 def test_read_excel_file_not_found():
     with pytest.raises(FileNotFoundError):
@@ -19,16 +20,110 @@ def test_create_pivot_table():
     pivot = ExcelHandler.create_pivot_table(df, values='B', index=['A'])
     assert 'B' in pivot.columns
 
-@patch('core.excel_handler.pd.ExcelWriter')
-def test_write_excel(mock_writer):
-    df = pd.DataFrame({'A': [1]})
-    with patch('os.makedirs'), patch('os.path.exists', return_value=False):
-        ExcelHandler.write_excel(df, 'out.xlsx')
-    assert mock_writer.called
-
-@patch('core.excel_handler.pd.ExcelWriter')
-def test_write_multiple_sheets(mock_writer):
-    dfs = {'Sheet1': pd.DataFrame({'A': [1]})}
-    with patch('os.makedirs'), patch('os.path.exists', return_value=False):
-        ExcelHandler.write_multiple_sheets(dfs, 'out.xlsx')
-    assert mock_writer.called 
\ No newline at end of file
+def test_create_pivot_table_categorical_keys():
+    df = pd.DataFrame({'A': pd.Categorical(['x', 'y'], categories=['x', 'y', 'z']),
+                       'C': pd.Categorical(['p', 'q']), 'B': [1, 2]})
+    pivot = ExcelHandler.create_pivot_table(df, values='B', index=['A', 'C'])
+    assert len(pivot) == 2
+
+def test_create_pivot_table_empty():
+    df = pd.DataFrame({'A': pd.Series([], dtype=str), 'B': pd.Series([], dtype=float)})
+    pivot = ExcelHandler.create_pivot_table(df, values='B', index=['A'])
+    assert pivot.columns.tolist() == ['A', 'B']
+    assert pivot.empty
+
+def test_write_excel(tmp_path):
+    df = pd.DataFrame({'A': ['R1', '    P1', '    P2'], 'Ecart': [None, 1.5, -2.0]})
+    output_file = str(tmp_path / 'out.xlsx')
+    ExcelHandler.write_excel(df, output_file, 'Summary')
+    ws = load_workbook(output_file)['Summary']
+    assert [c.value for c in ws[1]] == ['A', 'Ecart']
+    assert ws['A2'].font.b and not ws['A3'].font.b
+    assert ws['B2'].value is None
+    rules = {rule.operator: rule for cf in ws.conditional_formatting for rule in cf.rules}
+    assert set(rules) == {'greaterThan', 'lessThan'}
+    assert str(next(iter(ws.conditional_formatting)).sqref) == 'B2:B4'
+
+def test_write_multiple_sheets(tmp_path):
+    dfs = {'Sheet1': pd.DataFrame({'A': [1]}), 'Empty': pd.DataFrame({'A': []})}
+    output_file = str(tmp_path / 'out.xlsx')
+    ExcelHandler.write_multiple_sheets(dfs, output_file)
+    wb = load_workbook(output_file)
+    assert wb.sheetnames == ['Sheet1', 'Empty']
+    assert wb['Sheet1']['A2'].value == 1
+
+
+def test_read_excel_columns(tmp_path):
+    from openpyxl import Workbook
+    file_path = tmp_path / "deployments.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['Nom', 'Autre', 'Phase du projet'])
+    ws.append(['P1', 'x', 'Recette'])
+    ws.append([None, None, None])
+    ws.append(['P2', 'y', None])
+    wb.save(file_path)
+    df = ExcelHandler.read_excel_columns(str(file_path), ['Nom', 'Phase du projet', 'Absente'])
+    assert df.columns.tolist() == ['Nom', 'Phase du projet']
+    assert df['Nom'].tolist() == ['P1', 'P2']
+
+
+def test_read_excel_columns_keep_blank_rows(tmp_path):
+    from openpyxl import Workbook
+    file_path = tmp_path / "deployments.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['Nom', 'Phase du projet'])
+    ws.append(['P1', 'Recette'])
+    ws.append([None, None])
+    ws.append(['P2', '=B2'])
+    wb.save(file_path)
+    df = ExcelHandler.read_excel_columns(str(file_path), ['Nom', 'Phase du projet'], keep_blank_rows=True)
+    # One row per sheet row, and formulas are never returned as text
+    assert df['Nom'].isna().tolist() == [False, True, False]
+    assert df['Phase du projet'].iloc[2] != '=B2'
+
+
+def test_write_multiple_sheets_with_graphs(tmp_path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.bar(['a', 'b'], [1, 2])
+    output_file = str(tmp_path / "out.xlsx")
+    ExcelHandler.write_multiple_sheets({'Sheet1': pd.DataFrame({'A': [1]})}, output_file,
+                                       graphs_sheet='graphes', figures=[fig], ecart_sum=1.5)
+    wb = load_workbook(output_file)
+    assert wb.sheetnames == ['Sheet1', 'graphes']
+    assert len(wb['graphes']._images) == 1
+    assert wb['graphes']['A27'].value == 'somme ecart = 1.50'
+
+
+def test_peek_header(tmp_path):
+    file_path = str(tmp_path / "data.xlsx")
+    ExcelHandler.write_excel(pd.DataFrame({'Ressource': [1], 'Projet': ['P1']}), file_path)
+    assert ExcelHandler.peek_header(file_path) == ['Ressource', 'Projet']
+
+
+def test_peek_header_openpyxl(tmp_path, monkeypatch):
+    import core.excel_handler as excel_handler
+    monkeypatch.setattr(excel_handler, '_READ_ENGINE', 'openpyxl')
+    file_path = str(tmp_path / "data.xlsx")
+    ExcelHandler.write_excel(pd.DataFrame({'Ressource': [1], 'Projet': ['P1']}), file_path)
+    assert ExcelHandler.peek_header(file_path) == ['Ressource', 'Projet']
+
+
+def test_cached_read(tmp_path, monkeypatch):
+    import core.excel_handler as excel_handler
+    monkeypatch.setattr(excel_handler, '_CACHE_DIR', str(tmp_path / "cache"))
+    file_path = str(tmp_path / "data.xlsx")
+    ExcelHandler.write_excel(pd.DataFrame({'A': [1, 2]}), file_path)
+    first = ExcelHandler.cached_read(ExcelHandler.read_excel, file_path)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    second = ExcelHandler.cached_read(ExcelHandler.read_excel, file_path)
+    assert second.equals(first)
+    # Editing the file replaces its entry instead of adding one
+    ExcelHandler.write_excel(pd.DataFrame({'A': [1, 2, 3]}), file_path)
+    third = ExcelHandler.cached_read(ExcelHandler.read_excel, file_path)
+    assert third['A'].tolist() == [1, 2, 3]
+    assert len(list((tmp_path / "cache").iterdir())) == 1
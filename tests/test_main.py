@@ -0,0 +1,26 @@
+import builtins
+import pandas as pd
+import main
+
+
+def test_generate_resource_summary(tmp_path, monkeypatch):
+    input_file = str(tmp_path / "consumption.xlsx")
+    deployments_file = str(tmp_path / "deployments.xlsx")
+    output_file = str(tmp_path / "summary.xlsx")
+    pd.DataFrame({'Ressource': ['Alice', 'Alice'], 'Projet': ['P1', 'P2'],
+                  'Soumise (h)': [16, 8]}).to_excel(input_file, index=False)
+    pd.DataFrame({'Nom': ['P1'], 'Niveau de connexion': ['Normée'], 'Phase du projet': ['Développement'],
+                  'Montant total (Contrat) (Commande)': [5000], 'Dernière Note': ['n1'],
+                  "Date d'affectation": [pd.Timestamp('2024-01-01')]}).to_excel(deployments_file, index=False)
+    answers = iter([input_file, deployments_file, output_file])
+    monkeypatch.setattr(main, 'get_user_file_path', lambda *args, **kwargs: next(answers))
+    monkeypatch.setattr(builtins, 'input', lambda *args: 'n')
+
+    main.generate_resource_summary()
+
+    summary = pd.read_excel(output_file, sheet_name='Resource Summary')
+    assert summary['Resource/ PROJET'].str.strip().tolist() == ['Alice', 'P1', 'P2']
+    assert summary['Charge JH'].fillna(0).tolist() == [0, 2, 1]
+    assert summary['Ecart'].tolist()[1] == -1.75
+    assert summary['Dernière Note'].tolist()[1] == 'n1'
+    assert summary['Durée'].iloc[1] > 0
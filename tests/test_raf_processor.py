@@ -18,4 +18,23 @@ def test_create_raf_summary_sheet():
     wb = MagicMock()
     df = pd.DataFrame({'Date de MEP': ['2023-01-01'], 'RAF': [1]})
     result = RAFProcessor.create_raf_summary_sheet(wb, df)
-    assert result is wb 
\ No newline at end of file
+    assert result is wb
+
+
+def test_calculate_raf_values():
+    df = pd.DataFrame({
+        'Niveau de connexion': ['Normée', 'Connexion EDI Sortante Pilote', None, 'Normée'],
+        'Phase du projet': ['Développement', 'Recette interne', 'Développement', 'Inconnue'],
+    })
+    out = RAFProcessor.calculate_raf(df)
+    assert out['RAF'].tolist()[:2] == [0.25, 6]
+    assert out['RAF'].iloc[2:].isna().all()
+
+
+def test_add_raf_to_workbook_column():
+    from openpyxl import Workbook
+    wb = Workbook()
+    wb.active.append(['Nom', 'Phase'])
+    df = pd.DataFrame({'RAF': [1.5, None]})
+    RAFProcessor.add_raf_to_workbook(wb, df)
+    assert [wb.active.cell(row=r, column=3).value for r in (1, 2, 3)] == ['RAF', 1.5, None]
@@ -0,0 +1,88 @@
+import queue
+import pytest
+import pandas as pd
+
+pytest.importorskip("PyQt5")
+from gui.resource_tab import _resource_summary_job
+
+
+def _write_inputs(tmp_path, consumption, deployments):
+    input_file = str(tmp_path / "consumption.xlsx")
+    deployments_file = str(tmp_path / "deployments.xlsx")
+    pd.DataFrame(consumption).to_excel(input_file, index=False)
+    deployments = {'Montant total (Contrat) (Commande)': [1000] * len(deployments['Nom']),
+                   'Dernière Note': [None] * len(deployments['Nom']),
+                   "Date d'affectation": [None] * len(deployments['Nom']), **deployments}
+    pd.DataFrame(deployments).to_excel(deployments_file, index=False)
+    return input_file, deployments_file
+
+
+def test_resource_summary_job(tmp_path, monkeypatch):
+    import core.excel_handler as excel_handler
+    monkeypatch.setattr(excel_handler, '_CACHE_DIR', str(tmp_path / "cache"))
+    output_file = str(tmp_path / "summary.xlsx")
+    # Carol only works on a paused project; P3 is missing from the deployments, so it has no phase
+    input_file, deployments_file = _write_inputs(
+        tmp_path,
+        {'Ressource': ['Alice', 'Alice', 'Alice', 'Bob', 'Bob', 'Carol'],
+         'Projet': ['P1', 'P2', 'P3', 'P4', 'P1', 'P4'],
+         'Soumise (h)': [16, 8, 4, 24, 8, 40]},
+        {'Nom': ['P1', 'P2', 'P4'],
+         'Niveau de connexion': ['Normée', 'Connexion EDI', 'Normée'],
+         'Phase du projet': ['Développement', 'Recette interne', 'Projet en pause'],
+         'Montant total (Contrat) (Commande)': [5000, 1000, 2000],
+         'Dernière Note': ['n1', 'n2', 'n4']})
+
+    phases = frozenset(['', 'Développement', 'Recette interne'])
+    success, message, path, details = _resource_summary_job(
+        input_file, deployments_file, output_file, phases, None, queue.Queue())
+    assert success, details
+    assert path == output_file
+
+    summary = pd.read_excel(output_file, sheet_name='Resource Summary')
+    assert summary['Resource/ PROJET'].str.strip().tolist() == ['Alice', 'P1', 'P2', 'P3', 'Bob', 'P1', 'Carol']
+    assert summary['Charge JH'].fillna(0).tolist() == [0, 2, 1, 0.5, 0, 1, 0]
+    # Resource totals only count the projects that were kept
+    assert summary['Somme de Charge JH'].dropna().tolist() == [3.5, 1, 0]
+    assert summary['Ecart'].sum() == 0.5
+    assert pd.read_excel(output_file, sheet_name='Meta')['somme ecart'].tolist() == [0.5]
+    assert len(pd.read_excel(output_file, sheet_name='High CA')) == 2
+
+
+def test_resource_summary_job_no_phase_checked(tmp_path, monkeypatch):
+    import core.excel_handler as excel_handler
+    monkeypatch.setattr(excel_handler, '_CACHE_DIR', str(tmp_path / "cache"))
+    output_file = str(tmp_path / "summary.xlsx")
+    input_file, deployments_file = _write_inputs(
+        tmp_path,
+        {'Ressource': ['Alice', 'Bob'], 'Projet': ['P1', 'P2'], 'Soumise (h)': [16, 8]},
+        {'Nom': ['P1', 'P2'], 'Niveau de connexion': ['Normée', 'Normée'],
+         'Phase du projet': ['Développement', 'Recette interne']})
+
+    # Every project is filtered out: the resources are still listed, with 0 totals
+    success, message, path, details = _resource_summary_job(
+        input_file, deployments_file, output_file, [], None, queue.Queue())
+    assert success, details
+    summary = pd.read_excel(output_file, sheet_name='Resource Summary')
+    assert summary['Resource/ PROJET'].tolist() == ['Alice', 'Bob']
+    assert summary['Somme de Charge JH'].tolist() == [0, 0]
+
+
+def test_resource_summary_job_resource_with_zero_total(tmp_path, monkeypatch):
+    import core.excel_handler as excel_handler
+    monkeypatch.setattr(excel_handler, '_CACHE_DIR', str(tmp_path / "cache"))
+    output_file = str(tmp_path / "summary.xlsx")
+    # B's total is 0, so its row is dropped, but its P2 project (checked phase) is kept
+    input_file, deployments_file = _write_inputs(
+        tmp_path,
+        {'Ressource': ['A', 'B', 'B'], 'Projet': ['P1', 'P2', 'P3'], 'Soumise (h)': [8, 8, -8]},
+        {'Nom': ['P1', 'P2', 'P3'], 'Niveau de connexion': ['Normée'] * 3,
+         'Phase du projet': ['Développement', 'Développement', 'Projet en pause']})
+
+    success, message, path, details = _resource_summary_job(
+        input_file, deployments_file, output_file, ['Développement'], None, queue.Queue())
+    assert success, details
+    summary = pd.read_excel(output_file, sheet_name='Resource Summary')
+    assert summary['Resource/ PROJET'].str.strip().tolist() == ['A', 'P1', 'P2']
+    # A's total only counts its own project, not B's remaining one
+    assert summary['Somme de Charge JH'].tolist()[0] == 1
@@ -1,10 +1,33 @@
+import threading
+import numpy as np
 import pandas as pd
 from pathlib import Path
+import matplotlib
+# Charts are only encoded to PNG for the page, never shown on screen
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
 from shiny import App, ui, render, reactive
 
+# Use the fastest parsers that are installed; None leaves the choice to pandas
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except ImportError:
+    _EXCEL_ENGINE = None
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    _CSV_ENGINE = None
+
+# One figure per chart, cleared and redrawn on every render instead of being rebuilt;
+# the lock keeps concurrent sessions from drawing on the same figure
+_bar_fig, _bar_ax = plt.subplots(figsize=(6, 3))
+_pie_fig, _pie_ax = plt.subplots()
+_plot_lock = threading.Lock()
+
 app_ui = ui.page_sidebar(
     ui.sidebar(
         ui.h2("📁 Data Uploader"),
@@ -31,10 +54,7 @@ app_ui = ui.page_sidebar(
         ),
         ui.hr(),
         ui.h4("Data Table"),
-        ui.div(
-            ui.output_ui("table_ui"),
-            style="max-height:400px;overflow:auto; border:1px solid #eee; border-radius:8px;"
-        ),
+        ui.output_data_frame("table_ui"),
         class_="container-fluid"
     )
 )
@@ -45,17 +65,17 @@ def read_uploaded_file(fileinfo):
     file = fileinfo[0]
     ext = Path(file["name"]).suffix.lower()
     if ext == ".csv":
-        df = pd.read_csv(file["datapath"])
+        df = pd.read_csv(file["datapath"], engine=_CSV_ENGINE)
     elif ext in [".xlsx", ".xls"]:
-        df = pd.read_excel(file["datapath"])
+        df = pd.read_excel(file["datapath"], engine=_EXCEL_ENGINE)
     else:
         return None
     return df
 
 def plot_to_base64(fig):
     buf = BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
+    # Screen resolution is enough for an inline image and keeps the PNG small
+    fig.savefig(buf, format="png", dpi=72, bbox_inches="tight")
     buf.seek(0)
     img_base64 = base64.b64encode(buf.read()).decode("utf-8")
     return f'<img src="data:image/png;base64,{img_base64}" style="max-width:100%;height:auto;"/>'
@@ -65,9 +85,16 @@ def server(input, output, session):
     def df():
         return read_uploaded_file(input.file())
 
-    def get_column(data, colname):
-        norm_cols = {c.strip().lower(): c for c in data.columns}
-        return norm_cols.get(colname.strip().lower(), None)
+    @reactive.Calc
+    def norm_cols():
+        # Normalized name -> actual column name, rebuilt only when a new file is uploaded
+        data = df()
+        if data is None:
+            return {}
+        return {str(c).strip().lower(): c for c in data.columns}
+
+    def get_column(colname):
+        return norm_cols().get(colname.strip().lower(), None)
 
     @output()
     @render.ui
@@ -87,20 +114,24 @@ def server(input, output, session):
         data = df()
         if data is None:
             return ui.p("Bar chart: No data uploaded.")
-        col_proj = get_column(data, "Resource/ PROJET")
-        col_jh = get_column(data, "Somme de Charge JH")
+        col_proj = get_column("Resource/ PROJET")
+        col_jh = get_column("Somme de Charge JH")
         if col_proj is None or col_jh is None:
             return ui.p(f"Bar chart: Required columns not found. Available columns: {list(data.columns)}")
         chart_data = data.dropna(subset=[col_jh])
         if chart_data.empty:
             return ui.p("Bar chart: No data to display after filtering NaN values.")
-        fig, ax = plt.subplots(figsize=(6, 3))
-        ax.bar(chart_data[col_proj].astype(str), chart_data[col_jh])
-        ax.set_xlabel("Consultants")
-        ax.set_ylabel(col_jh)
-        ax.set_title("Charge JH par consultant")
-        plt.xticks(rotation=45, ha="right")
-        return ui.HTML(plot_to_base64(fig))
+        # One bar per consultant (repeated rows are summed), limited to the 50 largest
+        totals = (chart_data.groupby(col_proj, sort=False, observed=True)[col_jh].sum()
+                  .sort_values(ascending=False).head(50))
+        with _plot_lock:
+            _bar_ax.clear()
+            _bar_ax.bar(totals.index.astype(str), totals.to_numpy())
+            _bar_ax.set_xlabel("Consultants")
+            _bar_ax.set_ylabel(col_jh)
+            _bar_ax.set_title("Charge JH par consultant")
+            plt.setp(_bar_ax.get_xticklabels(), rotation=45, ha="right")
+            return ui.HTML(plot_to_base64(_bar_fig))
 
     @output()
     @render.ui
@@ -108,29 +139,31 @@ def server(input, output, session):
         data = df()
         if data is None:
             return ui.p("Pie chart: No data uploaded.")
-        col_ecart = get_column(data, "ecart")
+        col_ecart = get_column("ecart")
         if col_ecart is None:
             return ui.p(f"Pie chart: 'ecart' column not found. Available columns: {list(data.columns)}")
-        ecart = data[col_ecart].dropna()
-        if ecart.empty:
+        # Drop missing values on the raw float array instead of building a filtered Series
+        ecart = data[col_ecart].to_numpy(dtype=np.float64, na_value=np.nan)
+        ecart = ecart[~np.isnan(ecart)]
+        if ecart.size == 0:
             return ui.p("Pie chart: No data to display after filtering NaN values.")
-        categories = [
-            (ecart > 0).sum(),
-            (ecart < 0).sum(),
-            (ecart == 0).sum(),
-        ]
+        # Count negative / zero / positive values in one pass: np.sign + 1 maps them to 0 / 1 / 2
+        negative, zero, positive = np.bincount(np.sign(ecart).astype(np.int8) + 1, minlength=3)
+        categories = [positive, negative, zero]
         labels = ["Positive", "Negative", "Zero"]
-        fig, ax = plt.subplots()
-        ax.pie(categories, labels=labels, autopct="%1.1f%%", startangle=90)
-        ax.set_title("Distribution de l'ecarts")
-        return ui.HTML(plot_to_base64(fig))
+        with _plot_lock:
+            _pie_ax.clear()
+            _pie_ax.pie(categories, labels=labels, autopct="%1.1f%%", startangle=90)
+            _pie_ax.set_title("Distribution de l'ecarts")
+            return ui.HTML(plot_to_base64(_pie_fig))
 
     @output()
-    @render.ui
+    @render.data_frame
     def table_ui():
         data = df()
         if data is None:
-            return ui.p("No file uploaded or unsupported file type.")
-        return ui.HTML(data.to_html(index=False, classes="table table-striped"))
+            return None
+        # The grid only renders the visible rows, instead of an HTML table of the whole file
+        return render.DataGrid(data, height="400px", summary=True)
 
 app = App(app_ui, server)